@@ -34,3 +34,15 @@ def user_client(token):
     client = APIClient()
     client.credentials(HTTP_AUTHORIZATION=f'Bearer {token["access"]}')
     return client
+
+
+@pytest.fixture
+def claims_client(user, settings):
+    from rest_framework.test import APIClient
+    from api.serializers import TokenObtainPairSerializer
+
+    settings.JWT_USER_STATUS_TTL = 0
+    refresh = TokenObtainPairSerializer.get_token(user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
@@ -0,0 +1,48 @@
+import pytest
+
+
+class TestAuthorAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_authors_get(self, client, user, another_user, post, post_2, another_post):
+        response = client.get('/api/v1/authors/')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/authors/` возвращается статус 200'
+        )
+
+        test_data = response.json()
+        assert 'results' in test_data, (
+            'Проверьте, что `/api/v1/authors/` возвращает постраничный ответ'
+        )
+        test_author = test_data['results'][0]
+        assert test_author['posts_count'] == 2, (
+            'Проверьте, что `/api/v1/authors/` возвращает количество постов автора'
+        )
+        assert test_author['posts'] == [str(post_2), str(post)], (
+            'Проверьте, что `/api/v1/authors/` возвращает последние посты автора'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_authors_query_count(self, client, django_assert_num_queries,
+                                 user, another_user, post, post_2, another_post):
+        from posts.models import Post
+
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=user) for i in range(10)
+        )
+        # count, users page, latest posts preview
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/authors/')
+        assert len(response.json()['results'][0]['posts']) == 3, (
+            'Проверьте, что `/api/v1/authors/` ограничивает количество постов автора'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_authors_is_following(self, user_client, user, another_user, follow_1):
+        response = user_client.get('/api/v1/authors/')
+        is_following = {
+            author['id']: author['is_following'] for author in response.json()['results']
+        }
+        assert is_following == {user.id: False, another_user.id: True}, (
+            'Проверьте, что `/api/v1/authors/` возвращает, подписан ли пользователь на автора'
+        )
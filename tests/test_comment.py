@@ -181,3 +181,75 @@ class TestCommentAPI:
             'Проверьте, что при DELETE запросе `/api/v1/posts/{post.id}/comments/{comment.id}/` '
             'для не своего комментария возвращаете статус 403'
         )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_comments_bulk_create(self, user_client, post, user):
+        url = f'/api/v1/posts/{post.id}/comments/bulk/'
+        data = [{'text': 'Коммент 1'}, {'text': 'Коммент 2'}]
+
+        response = user_client.post('/api/v1/posts/0/comments/bulk/', data=data, format='json')
+        assert response.status_code == 404, (
+            'Проверьте, что при POST запросе на массовое создание комментариев '
+            'к несуществующему посту возвращается статус 404'
+        )
+
+        response = user_client.post(url, data=data, format='json')
+        assert response.status_code == 201, (
+            f'Проверьте, что при POST запросе на `{url}` с правильными данными возвращается статус 201'
+        )
+        assert all(item['post'] == post.id for item in response.json()), (
+            f'Проверьте, что при POST запросе на `{url}` комментарии создаются к указанному посту'
+        )
+        assert Comment.objects.filter(post=post, author=user).count() == 2, (
+            f'Проверьте, что при POST запросе на `{url}` создаются комментарии'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_comment_write_num_queries(self, claims_client, post, comment_1_post, django_assert_num_queries):
+        url = f'/api/v1/posts/{post.id}/comments/{comment_1_post.id}/'
+        # select comment with author, update comment
+        with django_assert_num_queries(2):
+            response = claims_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == 200, (
+            f'Проверьте, что PATCH запрос `{url}` выполняет постоянное число запросов к базе данных'
+        )
+        # select comment with author, delete comment in a transaction,
+        # update post and author counters
+        with django_assert_num_queries(5):
+            response = claims_client.delete(url)
+        assert response.status_code == 204, (
+            f'Проверьте, что DELETE запрос `{url}` выполняет постоянное число запросов к базе данных'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_comments_list_num_queries(self, claims_client, post, user, django_assert_num_queries):
+        from posts.models import Comment
+
+        url = f'/api/v1/posts/{post.id}/comments/'
+        for count in (1, 10):
+            Comment.objects.bulk_create(
+                Comment(author=user, post=post, text=f'Коммент {i}')
+                for i in range(count)
+            )
+            with django_assert_num_queries(1):
+                claims_client.get(url)
+            # count and page
+            with django_assert_num_queries(2):
+                response = claims_client.get(f'{url}?limit=5')
+            assert len(response.json()['results']) == 5 or count < 5, (
+                f'Проверьте, что GET запрос `{url}?limit=5` возвращает страницу комментариев'
+            )
+            with django_assert_num_queries(1):
+                response = claims_client.get(f'{url}?page_size=5')
+            assert 'next' in response.json(), (
+                f'Проверьте, что GET запрос `{url}?page_size=5` возвращает курсорную пагинацию'
+            )
+
+        # count and post existence check, the empty page isn't selected
+        with django_assert_num_queries(2):
+            response = claims_client.get(f'{url}?limit=5&offset=100')
+        assert response.status_code == 200
+        response = claims_client.get('/api/v1/posts/100500/comments/')
+        assert response.status_code == 404, (
+            'Проверьте, что GET запрос комментариев несуществующей статьи возвращает статус 404'
+        )
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+
+class TestExportAPI:
+    url = '/api/v1/export/posts/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_export_not_admin(self, client, user_client, post):
+        assert client.get(self.url).status_code == 401, (
+            f'Проверьте, что `{self.url}` недоступен анонимному пользователю'
+        )
+        assert user_client.get(self.url).status_code == 403, (
+            f'Проверьте, что `{self.url}` доступен только администратору'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_export_stream(self, admin_user, post, another_post, comment_1_post):
+        from rest_framework.test import APIClient
+
+        admin_client = APIClient()
+        admin_client.force_authenticate(admin_user)
+        response = admin_client.get(self.url)
+        assert response.status_code == 200 and response.streaming, (
+            f'Проверьте, что `{self.url}` возвращает потоковый ответ'
+        )
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        assert [row['id'] for row in rows] == [post.id, another_post.id], (
+            f'Проверьте, что `{self.url}` выгружает все статьи в формате NDJSON'
+        )
+
+        url = '/api/v1/export/comments/?output=csv&since=2000-01-01'
+        response = admin_client.get(url)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert response['Content-Type'] == 'text/csv' and len(lines) == 2, (
+            f'Проверьте, что `{url}` выгружает комментарии в формате CSV'
+        )
+
+        for url in (f'{self.url}?output=xml', f'{self.url}?since=вчера'):
+            assert admin_client.get(url).status_code == 400, (
+                f'Проверьте, что `{url}` возвращает статус 400'
+            )
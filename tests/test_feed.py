@@ -0,0 +1,26 @@
+import pytest
+
+
+class TestFeedAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_feed_not_auth(self, client):
+        response = client.get('/api/v1/feed/')
+        assert response.status_code == 401, (
+            'Проверьте, что `/api/v1/feed/` при GET запросе без токена возвращает статус 401'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_feed_get(self, user_client, follow_1, post, another_post):
+        response = user_client.get('/api/v1/feed/')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/feed/` с токеном авторизации возвращается статус 200'
+        )
+
+        test_data = response.json()
+        assert 'results' in test_data, (
+            'Проверьте, что `/api/v1/feed/` возвращает постраничный ответ'
+        )
+        assert [item['id'] for item in test_data['results']] == [another_post.id], (
+            'Проверьте, что `/api/v1/feed/` возвращает только посты авторов, на которых подписан пользователь'
+        )
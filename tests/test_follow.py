@@ -138,3 +138,132 @@ class TestFollowAPI:
             'Проверьте, что при GET запросе с параметром `search` на `/api/v1/follow/` '
             'возвращается результат поиска по подписке'
         )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_follow_list_num_queries(self, claims_client, user, django_assert_num_queries):
+        from posts.models import User
+
+        url = '/api/v1/follow/'
+        for count in (1, 10):
+            User.objects.bulk_create(
+                User(username=f'author_{count}_{i}') for i in range(count)
+            )
+            Follow.objects.bulk_create(
+                Follow(user=user, following=author)
+                for author in User.objects.filter(username__startswith=f'author_{count}_')
+            )
+            with django_assert_num_queries(1):
+                response = claims_client.get(url)
+            assert len(response.json()) == Follow.objects.filter(user=user).count(), (
+                f'Проверьте, что GET запрос `{url}` выполняет постоянное число запросов к базе данных'
+            )
+            # count and page
+            with django_assert_num_queries(2):
+                response = claims_client.get(f'{url}?limit=5')
+            assert len(response.json()['results']) == min(5, Follow.objects.filter(user=user).count()), (
+                f'Проверьте, что GET запрос `{url}?limit=5` возвращает страницу подписок'
+            )
+            with django_assert_num_queries(1):
+                response = claims_client.get(f'{url}?page_size=5')
+            assert 'next' in response.json(), (
+                f'Проверьте, что GET запрос `{url}?page_size=5` возвращает курсорную пагинацию'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_follow_search_prefix(self, user_client, user, user_2, another_user, follow_1, follow_5):
+        response = user_client.get(f'/api/v1/follow/?username={user_2.username.upper()}')
+        assert [row['following'] for row in response.json()] == [user_2.username], (
+            'Проверьте, что параметр `username` находит авторов по началу имени без учета регистра'
+        )
+        response = user_client.get('/api/v1/follow/?username=User2')
+        assert response.json() == [], (
+            'Проверьте, что параметр `username` ищет по началу имени пользователя'
+        )
+        user_2.first_name = 'Мария'
+        user_2.save()
+        for search in ('User2', 'Мари'):
+            response = user_client.get(f'/api/v1/follow/?search={search}')
+            assert [row['following'] for row in response.json()] == [user_2.username], (
+                'Проверьте, что поиск `search` по подпискам ищет подстроку в имени пользователя, имени и фамилии'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_follow_create_num_queries(self, claims_client, user, another_user, django_assert_max_num_queries):
+        url = '/api/v1/follow/'
+        data = {'following': another_user.username}
+        # select following, insert in a transaction, feed backfill, counters
+        with django_assert_max_num_queries(7):
+            response = claims_client.post(url, data=data)
+        assert response.status_code == 201, (
+            f'Проверьте, что при POST запросе на `{url}` создается подписка'
+        )
+        # no existence check before the insert
+        with django_assert_max_num_queries(3):
+            response = claims_client.post(url, data=data)
+        assert response.status_code == 400, (
+            f'Проверьте, что при повторной подписке POST запрос на `{url}` возвращает статус 400'
+        )
+        assert Follow.objects.filter(user=user).count() == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_follow_bulk(self, user_client, user, user_2, another_user, follow_1):
+        url = '/api/v1/follow/bulk/'
+        data = {'follow': [user_2.username, another_user.username], 'unfollow': []}
+        response = user_client.post(url, data=data, format='json')
+        assert response.status_code == 200, (
+            f'Проверьте, что POST запрос на `{url}` подписывает на список авторов'
+        )
+        assert response.json() == {'followed': [user_2.username], 'unfollowed': []}, (
+            f'Проверьте, что POST запрос на `{url}` возвращает новых авторов без уже имеющихся подписок'
+        )
+        assert set(Follow.objects.filter(user=user).values_list('following__username', flat=True)) == {
+            user_2.username, another_user.username
+        }
+        user_2.stats.refresh_from_db()
+        user.stats.refresh_from_db()
+        assert (user_2.stats.followers_count, user.stats.following_count) == (1, 2), (
+            f'Проверьте, что POST запрос на `{url}` обновляет счетчики подписок'
+        )
+
+        data = {'unfollow': [user_2.username, another_user.username]}
+        response = user_client.post(url, data=data, format='json')
+        assert response.json() == {'followed': [], 'unfollowed': [user_2.username, another_user.username]}, (
+            f'Проверьте, что POST запрос на `{url}` отписывает от списка авторов'
+        )
+        assert not Follow.objects.filter(user=user).exists()
+        user_2.stats.refresh_from_db()
+        assert user_2.stats.followers_count == 0
+
+        for data in ({'follow': [user.username]}, {'follow': ['nobody']},
+                     {'follow': [user_2.username], 'unfollow': [user_2.username]}):
+            response = user_client.post(url, data=data, format='json')
+            assert response.status_code == 400, (
+                f'Проверьте, что POST запрос на `{url}` с неправильными данными возвращает статус 400'
+            )
+        assert not Follow.objects.filter(user=user).exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_follow_status(self, user_client, user, user_2, another_user, follow_1, follow_2):
+        url = '/api/v1/follow/status/'
+        response = user_client.get(url, {'username': [user_2.username, another_user.username, 'nobody']})
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос `{url}` возвращает статус 200'
+        )
+        assert response.json() == {
+            user_2.username: {'following': False, 'followed_by': True},
+            another_user.username: {'following': True, 'followed_by': False},
+        }, (
+            f'Проверьте, что GET запрос `{url}` возвращает статус подписки на пользователей и их подписки на вас'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_follow_suggestions(self, user_client, user, user_2, another_user, follow_1, follow_3, follow_4):
+        url = '/api/v1/follow/suggestions/'
+        Follow.objects.create(user=another_user, following=user_2)
+        response = user_client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос `{url}` возвращает статус 200'
+        )
+        assert response.json() == [{'username': user_2.username, 'followed_by_following': 1}], (
+            f'Проверьте, что GET запрос `{url}` предлагает авторов, на которых подписаны ваши подписки'
+        )
@@ -181,3 +181,65 @@ class TestJWT:
             f'возвращается код {code_expected}. '
             'Валидацию должны проходить как refresh, так и access токены'
         )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_jwt_stateless_user(self, client, user, django_assert_num_queries):
+        from django.core.cache import cache
+
+        valid_data = {
+            'username': user.username,
+            'password': '1234567'
+        }
+        response = client.post(self.url_create, data=valid_data)
+        token_refresh = response.json().get('refresh')
+        response = client.post(self.url_refresh, data={'refresh': token_refresh})
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {response.json()["access"]}'}
+        url = '/api/v1/follow/'
+        cache.clear()
+        client.get(url, **headers)
+        with django_assert_num_queries(1):
+            response = client.get(url, **headers)
+        assert response.status_code == 200, (
+            f'Убедитесь, что при запросе `{url}` с токеном из `{self.url_create}` '
+            'пользователь не загружается из базы данных'
+        )
+
+        user.is_active = False
+        user.save()
+        cache.clear()
+        response = client.get(url, **headers)
+        assert response.status_code == 401, (
+            f'Убедитесь, что при запросе `{url}` токен заблокированного '
+            'пользователя не принимается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_jwt_stateless_user_current(self, client, user, settings, django_assert_num_queries):
+        from django.core.cache import cache
+
+        settings.JWT_USER_STATUS_TTL = 60
+        valid_data = {
+            'username': user.username,
+            'password': '1234567'
+        }
+        response = client.post(self.url_create, data=valid_data)
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {response.json()["access"]}'}
+        user.username = 'RenamedUser'
+        user.save()
+        url = '/api/v1/posts/'
+        response = client.post(url, data={'text': 'Статья'}, **headers)
+        assert response.json().get('author') == 'RenamedUser', (
+            f'Убедитесь, что ответ на запрос `{url}` содержит текущее имя '
+            'пользователя, а не имя из токена'
+        )
+
+        user.delete()
+        cache.clear()
+        url = '/api/v1/follow/'
+        client.get(url, **headers)
+        with django_assert_num_queries(0):
+            response = client.get(url, **headers)
+        assert response.status_code == 401, (
+            f'Убедитесь, что при запросе `{url}` токен удалённого пользователя '
+            'не принимается и отсутствие пользователя кешируется'
+        )
@@ -1,6 +1,6 @@
 import pytest
 
-from posts.models import Post
+from posts.models import Comment, Post
 
 
 class TestPostAPI:
@@ -119,6 +119,63 @@ class TestPostAPI:
             f'Проверьте, что при GET запросе на `{url}` возвращается корректный список статей'
         )
 
+    @pytest.mark.django_db(transaction=True)
+    def test_posts_get_cursor_paginated(self, user_client, post, post_2, another_post):
+        url = '/api/v1/posts/?page_size=2'
+        response = user_client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+
+        test_data = response.json()
+        assert 'count' not in test_data, (
+            f'Проверьте, что при GET запросе на `{url}` курсорная пагинация не считает количество статей'
+        )
+        assert [item['id'] for item in test_data['results']] == [another_post.id, post_2.id], (
+            f'Проверьте, что при GET запросе на `{url}` статьи отсортированы по дате публикации'
+        )
+
+        response = user_client.get(test_data['next'])
+        test_data = response.json()
+        assert [item['id'] for item in test_data['results']] == [post.id], (
+            'Проверьте, что ссылка `next` курсорной пагинации возвращает следующую страницу'
+        )
+        assert test_data['next'] is None, (
+            'Проверьте, что на последней странице курсорной пагинации ссылка `next` пустая'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_posts_cursor_equal_dates(self, user_client, post, post_2, another_post):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        Post.objects.update(pub_date=post.pub_date)
+        expected = list(Post.objects.order_by('-id').values_list('id', flat=True))
+        url = '/api/v1/posts/?page_size=1'
+        ids, urls = [], []
+        with CaptureQueriesContext(connection) as context:
+            while url:
+                urls.append(url)
+                test_data = user_client.get(url).json()
+                ids += [item['id'] for item in test_data['results']]
+                url = test_data['next']
+        assert not any('OFFSET' in query['sql'] for query in context.captured_queries), (
+            'Проверьте, что курсорная пагинация фильтрует статьи по дате и id без OFFSET'
+        )
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация выдаёт статьи с одинаковой '
+            'датой публикации по одному разу'
+        )
+        test_data = user_client.get(urls[-1]).json()
+        previous_ids = []
+        while test_data['previous']:
+            test_data = user_client.get(test_data['previous']).json()
+            previous_ids += [item['id'] for item in test_data['results']]
+        assert previous_ids == expected[-2::-1], (
+            'Проверьте, что курсорная пагинация возвращается назад по статьям '
+            'с одинаковой датой публикации'
+        )
+
     @pytest.mark.django_db(transaction=True)
     def test_post_create(self, user_client, user, another_user, group_1):
         post_count = Post.objects.count()
@@ -231,3 +288,120 @@ class TestPostAPI:
         assert response.status_code == 403, (
             'Проверьте, что при DELETE запросе `/api/v1/posts/{id}/` для не своей статьи возвращаете статус 403'
         )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_posts_bulk_create(self, user_client, user, group_1):
+        post_count = Post.objects.count()
+        url = '/api/v1/posts/bulk/'
+
+        data = [{'text': 'Статья 1', 'group': group_1.id}, {'text': ''}]
+        response = user_client.post(url, data=data, format='json')
+        assert response.status_code == 400, (
+            f'Проверьте, что при POST запросе на `{url}` с неправильными данными возвращается статус 400'
+        )
+        errors = response.json()
+        assert errors[0] == {} and 'text' in errors[1], (
+            f'Проверьте, что при POST запросе на `{url}` ошибки возвращаются для каждого объекта'
+        )
+        assert post_count == Post.objects.count(), (
+            f'Проверьте, что при POST запросе на `{url}` с ошибками статьи не создаются'
+        )
+
+        data = [{'text': 'Статья 1', 'group': group_1.id}, {'text': 'Статья 2'}]
+        response = user_client.post(url, data=data, format='json')
+        assert response.status_code == 201, (
+            f'Проверьте, что при POST запросе на `{url}` с правильными данными возвращается статус 201'
+        )
+        test_data = response.json()
+        assert [item['text'] for item in test_data] == ['Статья 1', 'Статья 2'], (
+            f'Проверьте, что при POST запросе на `{url}` возвращается список новых статей'
+        )
+        assert all(item['author'] == user.username for item in test_data), (
+            f'Проверьте, что при POST запросе на `{url}` автором указывается пользователь'
+        )
+        assert post_count + 2 == Post.objects.count(), (
+            f'Проверьте, что при POST запросе на `{url}` создаются статьи'
+        )
+        assert [item['id'] for item in test_data] == list(
+            Post.objects.filter(text__in=['Статья 1', 'Статья 2'])
+            .order_by('text').values_list('id', flat=True)
+        ), (
+            f'Проверьте, что при POST запросе на `{url}` возвращаются id созданных статей'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_posts_search(self, client, post, post_2, another_post):
+        url = '/api/v1/posts/?search=12342341'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        assert [item['id'] for item in response.json()] == [post_2.id], (
+            f'Проверьте, что при GET запросе на `{url}` возвращаются только найденные статьи'
+        )
+
+        url = '/api/v1/posts/?search=тестовый пост&limit=2'
+        test_data = client.get(url).json()
+        assert test_data['count'] == 3 and len(test_data['results']) == 2, (
+            f'Проверьте, что при GET запросе на `{url}` результаты поиска пагинируются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_posts_search_ranked(self, client, user):
+        relevant_post = Post.objects.create(text='Коты, коты и коты', author=user)
+        post = Post.objects.create(text='Коты спят', author=user)
+        url = '/api/v1/posts/?search=коты&limit=2'
+        test_data = client.get(url).json()
+        assert [item['id'] for item in test_data['results']] == [relevant_post.id, post.id], (
+            f'Проверьте, что при GET запросе на `{url}` статьи отсортированы по релевантности'
+        )
+
+        url = '/api/v1/posts/?search=коты&page_size=2'
+        response = client.get(url)
+        assert response.status_code == 400 and 'search' in response.json(), (
+            f'Проверьте, что при GET запросе на `{url}` курсорная пагинация '
+            'не заменяет сортировку по релевантности'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_post_query_budget(self, user_client, post, post_2, comment_1_post, group_1,
+                               settings, monkeypatch):
+        from api.views import PostViewSet
+        from core.middleware import QueryBudgetExceeded
+
+        settings.QUERY_BUDGET_STRICT = True
+        Comment.objects.create(author=comment_1_post.author, post=post_2, text='Коммент')
+        budget = PostViewSet.query_budget
+        requests = {
+            'create': lambda post: user_client.post(
+                '/api/v1/posts/', data={'text': 'Статья', 'group': group_1.id}
+            ),
+            'destroy': lambda post: user_client.delete(f'/api/v1/posts/{post.id}/'),
+        }
+        for action, request in requests.items():
+            request(post)
+            monkeypatch.setitem(budget, action, budget[action] - 1)
+            with pytest.raises(QueryBudgetExceeded):
+                request(post_2)
+            monkeypatch.undo()
+        assert not Post.objects.filter(id__in=[post.id, post_2.id]).exists(), (
+            'Проверьте, что бюджет запросов создания и удаления статьи равен их числу'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_post_write_num_queries(self, claims_client, post, django_assert_num_queries):
+        url = f'/api/v1/posts/{post.id}/'
+        # select post with author, update post, update search index
+        with django_assert_num_queries(3):
+            response = claims_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == 200, (
+            f'Проверьте, что PATCH запрос `{url}` выполняет постоянное число запросов к базе данных'
+        )
+
+        # select post, its comments, delete feed items, post and search
+        # index row in a transaction, update author and group counters
+        with django_assert_num_queries(8):
+            response = claims_client.delete(url)
+        assert response.status_code == 204, (
+            f'Проверьте, что DELETE запрос `{url}` выполняет постоянное число запросов к базе данных'
+        )
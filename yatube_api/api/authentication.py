@@ -0,0 +1,72 @@
+from typing import Optional
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+# Token claims, which the user is built from without a database query
+USER_CLAIMS: tuple = ('is_active',)
+# Cached status of deleted users, because None is a cache miss
+USER_NOT_FOUND: str = 'not_found'
+
+
+def get_user_status_key(user_id: int) -> str:
+    return f'user-status:{user_id}'
+
+
+def get_user_status(user_id: int) -> Optional[bool]:
+    """
+    Function returns is_active of the user (None, if there is no such
+    user), cached for JWT_USER_STATUS_TTL seconds.
+    """
+    key = get_user_status_key(user_id)
+    status = cache.get(key)
+    if status is None:
+        status = (
+            User.objects.filter(pk=user_id)
+            .values_list('is_active', flat=True).first()
+        )
+        if status is None:
+            status = USER_NOT_FOUND
+        cache.set(key, status, settings.JWT_USER_STATUS_TTL)
+    return None if status == USER_NOT_FOUND else status
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication, which builds the user from the token claims.
+    The user has only id and is_active loaded, the other fields are
+    deferred and load on access, so responses get the current username.
+    Tokens without the claims fall back to loading the user from the
+    database.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        is_active = validated_token['is_active']
+        if settings.JWT_USER_STATUS_TTL:
+            is_active = get_user_status(user_id)
+            if is_active is None:
+                raise AuthenticationFailed(
+                    _('User not found'), code='user_not_found'
+                )
+        if not is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return User.from_db(
+            router.db_for_read(User),
+            (api_settings.USER_ID_FIELD, *USER_CLAIMS),
+            (user_id, is_active)
+        )
@@ -0,0 +1,29 @@
+from rest_framework.filters import BaseFilterBackend
+from posts.search import search_posts
+
+
+class PostSearchFilter(BaseFilterBackend):
+    """Full-text search of posts, most relevant first."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_posts(queryset, query)
+
+
+class FollowUsernameFilter(BaseFilterBackend):
+    """
+    Case-insensitive prefix search of followed authors by username,
+    which is a range scan of the username prefix index.
+    """
+
+    search_param = 'username'
+
+    def filter_queryset(self, request, queryset, view):
+        prefix = request.query_params.get(self.search_param, '').strip()
+        if not prefix:
+            return queryset
+        return queryset.filter(following__username__istartswith=prefix)
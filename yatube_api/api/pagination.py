@@ -0,0 +1,195 @@
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from .filters import PostSearchFilter
+
+# Separator of the ordering fields values in cursor positions
+POSITION_SEPARATOR: str = '|'
+
+
+def reversed_ordering(ordering: tuple) -> tuple:
+    return tuple(
+        order[1:] if order.startswith('-') else f'-{order}'
+        for order in ordering
+    )
+
+
+class PostCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the (pub_date, id) post index.
+
+    DRF positions keep only the first ordering field and skip its ties by
+    OFFSET. Here the position keeps values of all the ordering fields and
+    pages are filtered by the tuple, so rows with equal dates aren't
+    scanned again.
+    """
+
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-pub_date', '-id')
+
+    def _get_position_from_instance(self, instance, ordering):
+        return POSITION_SEPARATOR.join(
+            str(instance[field] if isinstance(instance, dict)
+                else getattr(instance, field))
+            for field in (order.lstrip('-') for order in ordering)
+        )
+
+    def get_position_filter(self, position: str, reverse: bool) -> Q:
+        """
+        Method returns filter of the rows following the position in the
+        ordering (preceding it for reverse cursors).
+        """
+        values = position.split(POSITION_SEPARATOR, len(self.ordering) - 1)
+        position_filter = Q()
+        equal = {}
+        for order, value in zip(self.ordering, values):
+            field = order.lstrip('-')
+            lookup = 'lt' if order.startswith('-') != reverse else 'gt'
+            position_filter |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        return position_filter
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*reversed_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(
+                self.get_position_filter(current_position, reverse)
+            )
+
+        # One more row tells whether there is a following page
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following_position = len(results) > len(self.page)
+        following_position = (
+            self._get_position_from_instance(results[-1], self.ordering)
+            if has_following_position else None
+        )
+
+        has_current_position = current_position is not None or offset > 0
+        if reverse:
+            self.page.reverse()
+            self.has_next = has_current_position
+            self.has_previous = has_following_position
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = has_current_position
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+
+class PostPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination with an opt-in cursor mode.
+
+    Requests with `cursor` or `page_size` query params are paginated by
+    PostCursorPagination: no COUNT(*) and no OFFSET scans. Other requests
+    keep the limit/offset behavior and response shape. Results of the
+    ranked_query_params are ordered by relevance, not by the cursor
+    ordering, so they are paginated by limit/offset only.
+    """
+
+    cursor_pagination_class = PostCursorPagination
+    ranked_query_params: tuple = (PostSearchFilter.search_param,)
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def is_cursor_request(self, request):
+        cursor_paginator = self.cursor_pagination_class
+        is_cursor_request = (
+            cursor_paginator.cursor_query_param in request.query_params
+            or cursor_paginator.page_size_query_param in request.query_params
+        )
+        ranked_params = [param for param in self.ranked_query_params
+                         if param in request.query_params]
+        if is_cursor_request and ranked_params:
+            raise ValidationError({
+                ranked_params[0]: 'Результаты по релевантности пагинируются '
+                                  'только параметрами limit и offset.'
+            })
+        return is_cursor_request
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_request(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            page = self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+            self.display_page_controls = (
+                self.cursor_paginator.display_page_controls
+            )
+            return page
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+
+class CommentCursorPagination(PostCursorPagination):
+    """Keyset pagination over the (created, id) comments of a post."""
+
+    ordering = ('-created', '-id')
+
+
+class CommentPagination(PostPagination):
+    """Opt-in limit/offset or cursor pagination of post comments."""
+
+    cursor_pagination_class = CommentCursorPagination
+    ranked_query_params = ()
+    max_limit = 100
+
+
+class AuthorPagination(LimitOffsetPagination):
+    """Limit/offset pagination, which is always on for authors."""
+
+    default_limit = 20
+    max_limit = 100
+
+
+class FollowCursorPagination(PostCursorPagination):
+    """Keyset pagination over the user's follows in following order."""
+
+    ordering = ('id',)
+
+
+class FollowPagination(PostPagination):
+    """Opt-in limit/offset or cursor pagination of the user's follows."""
+
+    cursor_pagination_class = FollowCursorPagination
+    ranked_query_params = ()
+    max_limit = 100
@@ -2,6 +2,10 @@ from rest_framework import permissions
 
 
 class AuthorOrReadOnly(permissions.BasePermission):
+    """
+    Writes are allowed to the object's author only. Authors are compared
+    by id, so the author isn't loaded from the database.
+    """
 
     def has_permission(self, request, view):
         return (request.method in permissions.SAFE_METHODS
@@ -9,4 +13,4 @@ class AuthorOrReadOnly(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         return (request.method in permissions.SAFE_METHODS
-                or obj.author == request.user)
+                or obj.author_id == request.user.id)
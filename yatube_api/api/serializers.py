@@ -1,19 +1,57 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework_simplejwt import serializers as jwt_serializers
+from core import metrics
 from posts.models import Comment, Follow, Group, Post, User
+from .authentication import USER_CLAIMS
 
+BULK_MAX_ITEMS: int = 1000
 
-class UserSerializer(serializers.ModelSerializer):
+
+class TimedSerializerMixin:
+    """Adds serialization and validation time to the request metrics."""
+
+    def to_representation(self, instance):
+        with metrics.timer('serializer'):
+            return super().to_representation(instance)
+
+    def run_validation(self, data=empty):
+        with metrics.timer('serializer'):
+            return super().run_validation(data)
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """User model serializer."""
 
-    posts = serializers.StringRelatedField(many=True, read_only=True)
+    posts = serializers.StringRelatedField(
+        many=True, read_only=True, source='latest_posts'
+    )
+    posts_count = serializers.IntegerField(
+        source='stats.posts_count', read_only=True
+    )
+    comments_count = serializers.IntegerField(
+        source='stats.comments_count', read_only=True
+    )
+    followers_count = serializers.IntegerField(
+        source='stats.followers_count', read_only=True
+    )
+    is_following = serializers.SerializerMethodField()
 
     class Meta:
         model = User
-        fields = ('id', 'first_name', 'last_name', 'posts')
+        fields = (
+            'id', 'first_name', 'last_name', 'posts',
+            'posts_count', 'comments_count', 'followers_count',
+            'is_following'
+        )
         ref_name = 'ReadOnlyUsers'
 
+    def get_is_following(self, obj) -> bool:
+        return self.context.get('is_following', {}).get(obj.id, False)
+
 
-class FollowSerializer(serializers.ModelSerializer):
+class FollowSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Follow model serializer."""
 
     user = serializers.SlugRelatedField(
@@ -41,15 +79,86 @@ class FollowSerializer(serializers.ModelSerializer):
         return value
 
 
-class GroupSerializer(serializers.ModelSerializer):
+class FollowCreateSerializer(FollowSerializer):
+    """
+    Follow model serializer, which creates a follow by a single insert:
+    duplicates are rejected by the unique constraint instead of
+    a pre-check query.
+    """
+
+    class Meta(FollowSerializer.Meta):
+        validators = []
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({'non_field_errors': [
+                serializers.UniqueTogetherValidator.message.format(
+                    field_names='user, following'
+                )
+            ]})
+
+
+class FollowBulkSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Usernames of the authors to follow and to unfollow at once."""
+
+    follow = serializers.ListField(
+        child=serializers.CharField(), default=list,
+        max_length=BULK_MAX_ITEMS
+    )
+    unfollow = serializers.ListField(
+        child=serializers.CharField(), default=list,
+        max_length=BULK_MAX_ITEMS
+    )
+
+    def validate(self, attrs):
+        """Method replaces usernames by ids of the users."""
+        if set(attrs['follow']) & set(attrs['unfollow']):
+            raise serializers.ValidationError(
+                'Автор не может быть в обоих списках'
+            )
+        if self.context['request'].user.username in attrs['follow']:
+            raise serializers.ValidationError(
+                {'follow': ['Нельзя подписаться на себя']}
+            )
+        users_ids = dict(
+            User.objects.filter(
+                username__in=[*attrs['follow'], *attrs['unfollow']]
+            ).values_list('username', 'id')
+        )
+        errors = {}
+        for field in ('follow', 'unfollow'):
+            errors[field] = [
+                serializers.SlugRelatedField.default_error_messages[
+                    'does_not_exist'
+                ].format(slug_name='username', value=username)
+                for username in attrs[field] if username not in users_ids
+            ]
+        if any(errors.values()):
+            raise serializers.ValidationError(
+                {field: messages for field, messages in errors.items()
+                 if messages}
+            )
+        return {
+            'follow': [users_ids[username] for username in attrs['follow']],
+            'unfollow': [
+                users_ids[username] for username in attrs['unfollow']
+            ],
+            'usernames': {pk: username for username, pk in users_ids.items()},
+        }
+
+
+class GroupSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Group model serializer."""
 
     class Meta:
         model = Group
-        fields = ('id', 'title', 'slug', 'description')
+        fields = ('id', 'title', 'slug', 'description', 'posts_count')
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Post model serializer."""
 
     author = serializers.SlugRelatedField(
@@ -58,10 +167,13 @@ class PostSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Post
-        fields = ('id', 'text', 'author', 'image', 'group', 'pub_date')
+        fields = (
+            'id', 'text', 'author', 'image', 'group', 'pub_date',
+            'comments_count'
+        )
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Comment model serializer."""
 
     author = serializers.SlugRelatedField(
@@ -72,3 +184,14 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ('post', 'id', 'author', 'text', 'created')
         read_only_fields = ('post',)
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """JWT pair serializer, which adds user claims to the tokens."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
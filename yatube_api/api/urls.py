@@ -1,17 +1,16 @@
 from django.urls import include, path, re_path
 from djoser.views import UserViewSet
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-    TokenVerifyView,
-)
+from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
 from .views import (
     AuthorViewSet,
     CommentViewSet,
+    ExportView,
+    FeedViewSet,
     FollowViewSet,
     GroupViewSet,
     PostViewSet,
+    TokenObtainPairView,
 )
 
 jwt_patterns = [
@@ -26,6 +25,7 @@ v1_router.register(r'authors', AuthorViewSet)
 v1_router.register(
     r'posts/(?P<post_id>\d+)/comments', CommentViewSet, basename='comment'),
 v1_router.register(r'groups', GroupViewSet)
+v1_router.register(r'feed', FeedViewSet, basename='feed')
 v1_router.register(r'follow', FollowViewSet, basename='follow')
 v1_router.register(r'posts', PostViewSet)
 v1_router.register(r'users', UserViewSet)
@@ -33,4 +33,5 @@ v1_router.register(r'users', UserViewSet)
 urlpatterns = [
     path('v1/', include(v1_router.urls)),
     path('v1/', include(jwt_patterns)),
+    path('v1/export/<str:name>/', ExportView.as_view(), name='export'),
 ]
@@ -1,16 +1,47 @@
-from rest_framework import filters, mixins, viewsets, permissions
+from typing import Callable
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from rest_framework import filters, mixins, status, viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import get_object_or_404
-from rest_framework.pagination import LimitOffsetPagination
-from posts.models import Group, Post, User
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt import views as jwt_views
+from core.cache import cache_page_for_anonymous, etag_on_version
+from posts.bulk import (
+    bulk_create_comments, bulk_create_posts, bulk_follow, bulk_unfollow
+)
+from posts.export import (
+    EXPORT_FORMATS, EXPORTS, get_export_queryset, iter_export
+)
+from posts.feed import get_feed
+from posts import graph
+from posts.models import Comment, Follow, Group, Post, User
+from .filters import FollowUsernameFilter, PostSearchFilter
+from .pagination import (
+    AuthorPagination,
+    CommentPagination,
+    FollowPagination,
+    PostCursorPagination,
+    PostPagination,
+)
 from .permissions import AuthorOrReadOnly
 from .serializers import (
+    BULK_MAX_ITEMS,
     CommentSerializer,
+    FollowBulkSerializer,
+    FollowCreateSerializer,
     FollowSerializer,
     GroupSerializer,
     PostSerializer,
+    TokenObtainPairSerializer,
     UserSerializer
 )
 
+AUTHOR_POSTS_PREVIEW: int = 3
+
 
 class ListCreateViewSet(mixins.ListModelMixin,
                         mixins.CreateModelMixin,
@@ -18,40 +49,113 @@ class ListCreateViewSet(mixins.ListModelMixin,
     pass
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class BulkCreateMixin:
+    """
+    Adds `bulk` action, which creates a list of objects at once
+    by the view set's bulk_create_function.
+    """
+
+    bulk_create_function: Callable[[list], list]
+
+    def get_bulk_fields(self) -> dict:
+        """Returns fields, which are set on every created object."""
+        return {'author': self.request.user}
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        if (not isinstance(request.data, list)
+                or len(request.data) > BULK_MAX_ITEMS):
+            raise ValidationError({'non_field_errors': [
+                f'Ожидается список не более чем из {BULK_MAX_ITEMS} объектов'
+            ]})
+        fields = self.get_bulk_fields()
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        model = serializer.child.Meta.model
+        objs = self.bulk_create_function([
+            model(**item, **fields) for item in serializer.validated_data
+        ])
+        return Response(
+            self.get_serializer(objs, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+@method_decorator(etag_on_version(), name='list')
+@method_decorator(etag_on_version(), name='retrieve')
+@method_decorator(cache_page_for_anonymous(), name='list')
+@method_decorator(cache_page_for_anonymous(), name='retrieve')
+class PostViewSet(BulkCreateMixin, viewsets.ModelViewSet):
     """Post model view set."""
 
-    queryset = Post.objects.all()
+    queryset = Post.objects.select_related('author')
     serializer_class = PostSerializer
     permission_classes = (AuthorOrReadOnly,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = PostPagination
+    filter_backends = (PostSearchFilter,)
+    query_budget = {
+        'list': 6, 'retrieve': 5, 'create': 7,
+        'update': 7, 'partial_update': 7, 'destroy': 11,
+    }
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
+    bulk_create_function = staticmethod(bulk_create_posts)
 
+
+@method_decorator(etag_on_version(), name='list')
+@method_decorator(etag_on_version(), name='retrieve')
+@method_decorator(cache_page_for_anonymous(), name='list')
+@method_decorator(cache_page_for_anonymous(), name='retrieve')
 class GroupViewSet(viewsets.ReadOnlyModelViewSet):
     """Group model view set."""
 
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
+    query_budget = 4
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+@method_decorator(etag_on_version(), name='list')
+@method_decorator(etag_on_version(), name='retrieve')
+class CommentViewSet(BulkCreateMixin, viewsets.ModelViewSet):
     """Comment model view set."""
 
     serializer_class = CommentSerializer
     permission_classes = (AuthorOrReadOnly,)
+    pagination_class = CommentPagination
+    query_budget = {
+        'list': 4, 'retrieve': 6, 'create': 7,
+        'update': 7, 'partial_update': 7, 'destroy': 10,
+    }
+
+    def get_post(self) -> Post:
+        return get_object_or_404(
+            Post.objects.only('id'), id=self.kwargs.get('post_id')
+        )
 
     def get_queryset(self):
-        post_id = self.kwargs.get('post_id')
-        post = get_object_or_404(Post, id=post_id)
-        return post.comments
+        return Comment.objects.filter(
+            post_id=self.kwargs.get('post_id')
+        ).select_related('author')
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        results = response.data
+        if isinstance(results, dict):
+            results = results['results']
+        # an empty page is the only case, when the post may not exist
+        if not results:
+            self.get_post()
+        return response
 
     def perform_create(self, serializer):
-        post_id = self.kwargs.get('post_id')
-        post = get_object_or_404(Post, id=post_id)
-        serializer.save(author=self.request.user, post=post)
+        serializer.save(author=self.request.user, post=self.get_post())
+
+    def get_bulk_fields(self) -> dict:
+        return {**super().get_bulk_fields(), 'post': self.get_post()}
+
+    bulk_create_function = staticmethod(bulk_create_comments)
 
 
 class AuthorViewSet(viewsets.ReadOnlyModelViewSet):
@@ -59,6 +163,52 @@ class AuthorViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = User.objects.filter(is_staff=False, is_active=True)
     serializer_class = UserSerializer
+    pagination_class = AuthorPagination
+    query_budget = 5
+
+    def get_queryset(self):
+        latest_posts_ids = (
+            Post.objects.filter(author_id=OuterRef('author_id'))
+            .order_by('-pub_date', '-id')
+            .values('id')[:AUTHOR_POSTS_PREVIEW]
+        )
+        latest_posts = (
+            Post.objects.filter(id__in=Subquery(latest_posts_ids))
+            .order_by('-pub_date', '-id')
+        )
+        return (
+            super().get_queryset()
+            .select_related('stats')
+            .prefetch_related(
+                Prefetch(
+                    'posts', queryset=latest_posts, to_attr='latest_posts'
+                )
+            )
+            .order_by('id')
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if args and self.request.user.is_authenticated:
+            authors = args[0] if kwargs.get('many') else [args[0]]
+            kwargs['context'] = {
+                **self.get_serializer_context(),
+                'is_following': graph.is_following(
+                    self.request.user.id, [author.id for author in authors]
+                ),
+            }
+        return super().get_serializer(*args, **kwargs)
+
+
+class FeedViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Follow-feed view set."""
+
+    serializer_class = PostSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = PostCursorPagination
+    query_budget = 5
+
+    def get_queryset(self):
+        return get_feed(self.request.user)
 
 
 class FollowViewSet(ListCreateViewSet):
@@ -66,13 +216,113 @@ class FollowViewSet(ListCreateViewSet):
 
     serializer_class = FollowSerializer
     permission_classes = (permissions.IsAuthenticated,)
-    filter_backends = (filters.SearchFilter,)
+    pagination_class = FollowPagination
+    query_budget = {
+        'list': 3, 'create': 8, 'follow_status': 4, 'suggestions': 4,
+    }
+    filter_backends = (filters.SearchFilter, FollowUsernameFilter)
     search_fields = (
         'following__username', 'following__first_name', 'following__last_name'
     )
 
     def get_queryset(self):
-        return self.request.user.follower
+        return (
+            Follow.objects.filter(user=self.request.user)
+            .select_related('user', 'following')
+            .order_by('id')
+        )
+
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return FollowCreateSerializer
+        if self.action == 'bulk':
+            return FollowBulkSerializer
+        return super().get_serializer_class()
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        """Follows and unfollows lists of authors at once."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        usernames = serializer.validated_data['usernames']
+        followed = bulk_follow(
+            request.user.id, serializer.validated_data['follow']
+        )
+        unfollowed = bulk_unfollow(
+            request.user.id, serializer.validated_data['unfollow']
+        )
+        return Response({
+            'followed': [usernames[pk] for pk in followed],
+            'unfollowed': [usernames[pk] for pk in unfollowed],
+        })
+
+    @action(detail=False, url_path='status')
+    def follow_status(self, request, *args, **kwargs):
+        """Tells, whether the user follows and is followed by the users."""
+        usernames = request.query_params.getlist('username')[:BULK_MAX_ITEMS]
+        users_ids = dict(
+            User.objects.filter(username__in=usernames)
+            .values_list('username', 'id')
+        )
+        following_ids = graph.get_following_ids(request.user.id)
+        followers_ids = graph.get_followers_ids(request.user.id)
+        return Response({
+            username: {
+                'following': user_id in following_ids,
+                'followed_by': user_id in followers_ids,
+            }
+            for username, user_id in users_ids.items()
+        })
+
+    @action(detail=False)
+    def suggestions(self, request, *args, **kwargs):
+        """Authors followed by the authors the user follows."""
+        suggestions = graph.get_suggestions(request.user.id)
+        usernames = dict(
+            User.objects.filter(id__in=[pk for pk, _ in suggestions])
+            .values_list('id', 'username')
+        )
+        return Response([
+            {'username': usernames[pk], 'followed_by_following': count}
+            for pk, count in suggestions if pk in usernames
+        ])
+
+
+class TokenObtainPairView(jwt_views.TokenObtainPairView):
+    """JWT pair view, which tokens carry user claims."""
+
+    serializer_class = TokenObtainPairSerializer
+
+
+class ExportView(APIView):
+    """Streaming NDJSON or CSV export of posts or comments."""
+
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request, name):
+        if name not in EXPORTS:
+            raise NotFound
+        output = request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({'output': [
+                f'Допустимые форматы: {", ".join(EXPORT_FORMATS)}'
+            ]})
+        try:
+            queryset = get_export_queryset(
+                name,
+                since=request.query_params.get('since'),
+                until=request.query_params.get('until')
+            )
+        except ValueError as error:
+            raise ValidationError({'non_field_errors': [str(error)]})
+        response = StreamingHttpResponse(
+            iter_export(name, output, queryset),
+            content_type=EXPORT_FORMATS[output]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{name}.{output}"'
+        )
+        return response
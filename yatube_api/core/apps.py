@@ -1,5 +1,12 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        if settings.DB_CONN_HEALTH_CHECKS:
+            from .db import close_unusable_connections
+            request_started.connect(close_unusable_connections)
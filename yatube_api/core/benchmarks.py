@@ -0,0 +1,107 @@
+"""
+Core app's benchmarks helpers.
+"""
+import statistics
+import time
+from contextlib import contextmanager
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test import RequestFactory
+
+
+def percentile(values: list, percent: float) -> float:
+    """Function returns percentile of values (nearest-rank method)."""
+    ordered = sorted(values)
+    rank = max(int(round(percent / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(timings: list) -> dict:
+    """Function returns latency summary of timings (seconds) in ms."""
+    return {
+        'count': len(timings),
+        'mean_ms': statistics.mean(timings) * 1000,
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p95_ms': percentile(timings, 95) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+        'rps': len(timings) / sum(timings) if sum(timings) else 0,
+    }
+
+
+def measure(func, repeat: int, setup=None) -> list:
+    """
+    Function calls func repeat times and returns timings.
+    The setup function is called before each call, out of timing.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+@contextmanager
+def throwaway_database(current: bool = False):
+    """
+    Context manager runs its block in a new test database, which is
+    destroyed on exit, or in the configured database, if current.
+    """
+    if current:
+        yield
+        return
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+class WSGIClient:
+    """
+    Minimal client, which runs requests through the real WSGI handler.
+    Unlike django.test.Client it keeps request_started/request_finished
+    connection handling, so CONN_MAX_AGE works as under a WSGI server.
+    """
+
+    def __init__(self, **headers):
+        self.handler = WSGIHandler()
+        self.factory = RequestFactory(**headers)
+
+    def get(self, path: str, **headers) -> int:
+        environ = self.factory.get(path, **headers).environ
+        status = []
+        response = self.handler(
+            environ, lambda code, headers: status.append(code)
+        )
+        b''.join(response)
+        response.close()
+        return int(status[0].split()[0])
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> dict:
+    """
+    Function compares latency summaries by name with the baseline ones.
+    A summary regressed, if its p95 grew more than the threshold share.
+    """
+    comparison = {}
+    for name, summary in results.items():
+        if name not in baseline:
+            continue
+        changes = {
+            f'{field}_change': (
+                summary[field] / baseline[name][field] - 1
+                if baseline[name][field] else 0
+            )
+            for field in ('p50_ms', 'p95_ms', 'rps')
+        }
+        comparison[name] = {
+            **changes,
+            'regression': changes['p95_ms_change'] > threshold,
+        }
+    return comparison
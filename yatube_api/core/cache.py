@@ -0,0 +1,108 @@
+"""
+Core app's cache functions: version counters and page caching.
+
+Cached pages are keyed on a version counter, so bumping the counter
+invalidates all pages of the namespace at once. Versions and pages must
+live in a cache shared by all workers (see CACHE_BACKEND in settings).
+"""
+import time
+from functools import wraps
+from hashlib import md5
+from django.conf import settings
+from django.core.cache import cache
+from django.views.decorators.http import condition
+
+PAGES_NAMESPACE: str = 'pages'
+
+
+def get_version_key(namespace: str) -> str:
+    return f'version:{namespace}'
+
+
+def get_version(namespace: str) -> int:
+    """Function returns current version of the namespace."""
+    key = get_version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # a fresh counter never reuses versions of an evicted one
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_version(namespace: str) -> None:
+    """Function invalidates everything cached for the namespace."""
+    try:
+        cache.incr(get_version_key(namespace))
+    except ValueError:
+        get_version(namespace)
+
+
+def get_page_hash(request, namespace: str) -> str:
+    """Function returns hash of the page url for the namespace version."""
+    url = '|'.join((
+        str(get_version(namespace)),
+        request.get_full_path(),
+        request.META.get('HTTP_ACCEPT', '')
+    ))
+    return md5(url.encode()).hexdigest()
+
+
+def get_page_key(request, namespace: str) -> str:
+    """Function returns cache key of the page for the namespace version."""
+    return f'page:{namespace}:{get_page_hash(request, namespace)}'
+
+
+def etag_on_version(namespace: str = PAGES_NAMESPACE):
+    """
+    Decorator answers conditional GET requests with 304 Not Modified
+    until the namespace version is bumped, without calling the view.
+    Only successful responses get the ETag, so errors aren't revalidated.
+    """
+    def etag_func(request, *args, **kwargs):
+        return get_page_hash(request, namespace)
+
+    def decorator(view_func):
+        conditional_view = condition(etag_func=etag_func)(view_func)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if response.status_code not in (200, 304):
+                del response['ETag']
+            return response
+        return wrapper
+    return decorator
+
+
+def cache_page_for_anonymous(namespace: str = PAGES_NAMESPACE):
+    """
+    Decorator caches successful GET responses for anonymous users
+    until the namespace version is bumped or CACHE_TTL expires.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if (request.method != 'GET'
+                    or request.user.is_authenticated):
+                return view_func(request, *args, **kwargs)
+
+            key = get_page_key(request, namespace)
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            if callable(getattr(response, 'render', None)):
+                response.add_post_render_callback(
+                    lambda rendered: cache.set(
+                        key, rendered, settings.CACHE_TTL
+                    )
+                )
+            else:
+                cache.set(key, response, settings.CACHE_TTL)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,8 @@
+from django.conf import settings
+
+
+def fragment_cache(request):
+    """Context function. Add cached fragments lifetime var to context."""
+    return {
+        'fragment_cache_ttl': settings.FRAGMENT_CACHE_TTL
+    }
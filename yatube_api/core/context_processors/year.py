@@ -1,8 +1,9 @@
-from datetime import datetime
+from datetime import date
+from django.utils.functional import SimpleLazyObject
 
 
 def year(request):
-    """Context function. Add current year var to context."""
+    """Context function. Add current year var, computed on use, to context."""
     return {
-        'year': datetime.today().year
+        'year': SimpleLazyObject(lambda: date.today().year)
     }
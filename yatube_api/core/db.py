@@ -0,0 +1,15 @@
+"""
+Core app's database connections functions.
+"""
+from django.db import connections
+
+
+def close_unusable_connections(**kwargs):
+    """
+    Signal receiver closes persistent connections, which were dropped
+    by the database server or a pooler while idle.
+    """
+    for connection in connections.all():
+        if (connection.connection is not None
+                and not connection.is_usable()):
+            connection.close()
@@ -0,0 +1,59 @@
+import json
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from core.benchmarks import WSGIClient, measure, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures per-request latency of a cheap endpoint with connections '
+        'closed after every request and with persistent connections.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='/api/v1/groups/')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument(
+            '--max-age', type=int, default=600,
+            help='CONN_MAX_AGE of the persistent mode.'
+        )
+        parser.add_argument('--json', action='store_true')
+
+    def run_mode(self, max_age: int, options: dict) -> dict:
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        client = WSGIClient()
+        client.get(options['url'])
+        timings = measure(
+            lambda: client.get(options['url']), options['requests']
+        )
+        connection.close()
+        return summarize(timings)
+
+    def handle(self, *args, **options):
+        initial_max_age = connection.settings_dict['CONN_MAX_AGE']
+        try:
+            # responses must not come from the page cache
+            with override_settings(CACHE_TTL=0):
+                results = {
+                    'vendor': connection.vendor,
+                    'url': options['url'],
+                    'per_request': self.run_mode(0, options),
+                    'persistent': self.run_mode(options['max_age'], options),
+                }
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = initial_max_age
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'{results["vendor"]} {results["url"]}')
+        for mode in ('per_request', 'persistent'):
+            summary = results[mode]
+            self.stdout.write(
+                f'{mode:>12}: mean {summary["mean_ms"]:.2f} ms, '
+                f'p50 {summary["p50_ms"]:.2f} ms, '
+                f'p95 {summary["p95_ms"]:.2f} ms, '
+                f'{summary["rps"]:.0f} req/s'
+            )
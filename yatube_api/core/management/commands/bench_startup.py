@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.benchmarks import summarize
+
+PROFILES: dict = {
+    'production': {'DEBUG': 'False'},
+    'development': {'DEBUG': 'True'},
+}
+STARTUP_SCRIPT: str = '''
+import json, time
+start = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+from django.core.handlers.wsgi import WSGIHandler
+from django.urls import get_resolver
+WSGIHandler()
+get_resolver().url_patterns
+print(json.dumps({
+    'setup': setup - start,
+    'ready': time.perf_counter() - start,
+    'middleware': len(django.conf.settings.MIDDLEWARE),
+    'apps': len(django.conf.settings.INSTALLED_APPS),
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures import and django.setup() time of a fresh worker '
+        'process for the production and development settings profiles.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=10)
+        parser.add_argument('--json', action='store_true')
+
+    def run_profile(self, env: dict, runs: int) -> dict:
+        env = {**os.environ, **env}
+        samples = []
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, '-c', STARTUP_SCRIPT],
+                cwd=settings.BASE_DIR, env=env, check=True,
+                capture_output=True, text=True
+            ).stdout
+            samples.append(json.loads(output))
+        return {
+            'apps': samples[0]['apps'],
+            'middleware': samples[0]['middleware'],
+            'setup': summarize([sample['setup'] for sample in samples]),
+            'ready': summarize([sample['ready'] for sample in samples]),
+        }
+
+    def handle(self, *args, **options):
+        results = {
+            name: self.run_profile(env, options['runs'])
+            for name, env in PROFILES.items()
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:>11}: {result["apps"]} apps, '
+                f'{result["middleware"]} middleware, '
+                f'django.setup() p50 {result["setup"]["p50_ms"]:.1f} ms, '
+                f'ready to serve p50 {result["ready"]["p50_ms"]:.1f} ms'
+            )
@@ -0,0 +1,173 @@
+import json
+from itertools import cycle
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import override_settings
+from core.benchmarks import (
+    compare, measure, summarize, throwaway_database
+)
+from posts.models import Post, User
+from posts.synthetic import SYNTHETIC_ALPHA, Generator
+
+BENCH_PASSWORD: str = 'bench-password'
+# Posts of post_detail requests, most commented first
+BENCH_POSTS: int = 50
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates synthetic data in a throwaway test database and measures '
+        'latency and throughput of the main HTML and API endpoints. '
+        'Results are saved as JSON and compared with a baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument(
+            '--follows', type=int, default=20,
+            help='Mean number of authors followed by a user.'
+        )
+        parser.add_argument('--alpha', type=float, default=SYNTHETIC_ALPHA)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--current-db', action='store_true',
+            help='Measure the configured database and its data.'
+        )
+        parser.add_argument('--output', help='File to save results to.')
+        parser.add_argument('--baseline', help='Results file to compare to.')
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Allowed p95 growth share over the baseline.'
+        )
+        parser.add_argument('--json', action='store_true')
+
+    def generate(self, options: dict) -> dict:
+        importer = Generator(
+            users=options['users'],
+            groups=options['groups'],
+            posts=options['posts'],
+            comments=options['comments'],
+            follows=options['follows'],
+            alpha=options['alpha'],
+            seed=options['seed'],
+        ).generate()
+        return {'users': User.objects.count(), **importer.imported}
+
+    def get_endpoints(self) -> dict:
+        """Method returns request functions of the measured endpoints."""
+        reader = (
+            User.objects.annotate(following_count=Count('follower'))
+            .order_by('-following_count', 'id').first()
+        )
+        if reader is None:
+            raise CommandError('Нет пользователей для измерений.')
+        reader.set_password(BENCH_PASSWORD)
+        reader.save(update_fields=['password'])
+        posts_ids = cycle(
+            Post.objects.order_by('-comments_count', 'id')
+            .values_list('id', flat=True)[:BENCH_POSTS]
+            or [0]
+        )
+        anonymous = Client()
+        client = Client()
+        client.force_login(reader)
+        credentials = {
+            'username': reader.username, 'password': BENCH_PASSWORD
+        }
+        tokens = anonymous.post('/api/v1/jwt/create/', credentials).json()
+        api = Client(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+        return {
+            'index': lambda: anonymous.get('/'),
+            'follow_index': lambda: client.get('/follow/'),
+            'post_detail': lambda: anonymous.get(
+                f'/posts/{next(posts_ids)}/'
+            ),
+            'api_posts': lambda: anonymous.get(
+                '/api/v1/posts/', {'limit': 20}
+            ),
+            'api_follow': lambda: api.get('/api/v1/follow/'),
+            'jwt_create': lambda: anonymous.post(
+                '/api/v1/jwt/create/', credentials
+            ),
+            'jwt_refresh': lambda: anonymous.post(
+                '/api/v1/jwt/refresh/', {'refresh': tokens['refresh']}
+            ),
+            'jwt_verify': lambda: anonymous.post(
+                '/api/v1/jwt/verify/', {'token': tokens['access']}
+            ),
+        }
+
+    def run_endpoints(self, requests: int) -> dict:
+        results = {}
+        for name, request in self.get_endpoints().items():
+            status_code = request().status_code
+            if status_code != 200:
+                raise CommandError(f'{name}: код ответа {status_code}.')
+            results[name] = summarize(measure(request, requests))
+        return results
+
+    def run(self, options: dict) -> dict:
+        scale = {} if options['current_db'] else self.generate(options)
+        # responses must not come from the page cache
+        with override_settings(CACHE_TTL=0):
+            endpoints = self.run_endpoints(options['requests'])
+        return {
+            'vendor': connection.vendor,
+            'scale': scale,
+            'requests': options['requests'],
+            'endpoints': endpoints,
+        }
+
+    def handle(self, *args, **options):
+        with throwaway_database(options['current_db']):
+            results = self.run(options)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2)
+        comparison = {}
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+            comparison = compare(
+                results['endpoints'], baseline['endpoints'],
+                options['threshold']
+            )
+
+        if options['json']:
+            self.stdout.write(json.dumps(
+                {**results, 'comparison': comparison}, indent=2
+            ))
+        else:
+            self.write_report(results, comparison)
+        regressions = [
+            name for name, change in comparison.items()
+            if change['regression']
+        ]
+        if regressions:
+            raise CommandError(
+                f'p95 вырос больше чем на {options["threshold"]:.0%}: '
+                f'{", ".join(regressions)}.'
+            )
+
+    def write_report(self, results: dict, comparison: dict) -> None:
+        self.stdout.write(f'{results["vendor"]} {results["scale"]}')
+        for name, summary in results['endpoints'].items():
+            line = (
+                f'{name:>12}: p50 {summary["p50_ms"]:.2f} ms, '
+                f'p95 {summary["p95_ms"]:.2f} ms, '
+                f'p99 {summary["p99_ms"]:.2f} ms, '
+                f'{summary["rps"]:.0f} req/s'
+            )
+            if name in comparison:
+                line += (
+                    f' (p50 {comparison[name]["p50_ms_change"]:+.0%}, '
+                    f'p95 {comparison[name]["p95_ms_change"]:+.0%})'
+                )
+            self.stdout.write(line)
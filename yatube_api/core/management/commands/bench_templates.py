@@ -0,0 +1,221 @@
+import json
+import time
+from copy import deepcopy
+from itertools import cycle
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test import RequestFactory
+from core.benchmarks import compare, measure, summarize, throwaway_database
+from core.template_backends import DjangoTemplates
+from posts.forms import CommentForm
+from posts.models import Post, User
+from posts.synthetic import Generator
+from posts.utils import COUNT_PAGE_POSTS, WindowPaginator, get_posts_list
+
+BENCH_TEMPLATES: dict = {
+    'index': 'posts/index.html',
+    'post_detail': 'posts/post_detail.html',
+}
+
+
+def get_page(queryset: QuerySet, number: int = 1):
+    """Function returns fetched page of the queryset, rows count included."""
+    paginator = WindowPaginator(queryset, COUNT_PAGE_POSTS)
+    paginator.count  # cached for the page links
+    return paginator.page(number)
+
+
+def get_backend(cached: bool) -> DjangoTemplates:
+    """
+    Function returns templates backend of the production (cached) or
+    development profile with the configured dirs and context processors.
+    """
+    params = deepcopy(settings.TEMPLATES[0])
+    del params['BACKEND']
+    params['NAME'] = 'production' if cached else 'development'
+    params.setdefault('APP_DIRS', False)
+    params['OPTIONS'].update(
+        debug=not cached,
+        loaders=(
+            [('django.template.loaders.cached.Loader',
+              settings.TEMPLATES_LOADERS)]
+            if cached else settings.TEMPLATES_LOADERS
+        ),
+    )
+    return DjangoTemplates(params)
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures time per render of the index and post pages: in the '
+        'production templates profile with cold and warm cache of post '
+        'fragments and in the development profile. Rows are fetched '
+        'before measuring, so only templates are timed. Results are '
+        'saved as JSON and compared with a baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--comments', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--pages', type=int, default=10,
+            help='Number of rendered list pages and their posts pages.'
+        )
+        parser.add_argument('--renders', type=int, default=200)
+        parser.add_argument(
+            '--current-db', action='store_true',
+            help='Render the configured database data.'
+        )
+        parser.add_argument('--output', help='File to save results to.')
+        parser.add_argument('--baseline', help='Results file to compare to.')
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Allowed p95 growth share over the baseline.'
+        )
+        parser.add_argument('--json', action='store_true')
+
+    def generate(self, options: dict) -> dict:
+        importer = Generator(
+            users=options['users'],
+            groups=max(options['users'] // 10, 1),
+            posts=options['posts'],
+            comments=options['comments'],
+            follows=0,
+            seed=options['seed'],
+        ).generate()
+        return {'users': User.objects.count(), **importer.imported}
+
+    def get_contexts(self, pages: int) -> dict:
+        """Method returns contexts of the rendered pages by name."""
+        index = []
+        for number in range(1, pages + 1):
+            try:
+                index.append({'page_obj': get_page(get_posts_list(), number)})
+            except EmptyPage:
+                break
+        if not index[0]['page_obj'].object_list:
+            raise CommandError('Нет постов для измерений.')
+        posts_ids = [
+            post.id for context in index for post in context['page_obj']
+        ]
+        posts = (
+            Post.objects.select_related('group', 'author__stats')
+            .filter(id__in=posts_ids[:pages])
+        )
+        post_detail = [
+            {
+                'post': post,
+                'comment_form': CommentForm(),
+                'page_obj': get_page(post.comments.select_related('author')),
+            }
+            for post in posts
+        ]
+        return {'index': index, 'post_detail': post_detail}
+
+    def measure_renders(self, backend: DjangoTemplates, template_name: str,
+                        contexts: list, renders: int,
+                        cold: bool = False) -> dict:
+        """
+        Method returns summary of the template renders, which get the
+        template from the backend, as views do. Cold renders start
+        with an empty cache, others follow a render of every context.
+        """
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        contexts_cycle = cycle(contexts)
+
+        def render():
+            backend.get_template(template_name).render(
+                next(contexts_cycle), request
+            )
+
+        if cold:
+            return summarize(measure(render, renders, setup=cache.clear))
+        for _ in contexts:
+            render()
+        return summarize(measure(render, renders))
+
+    def run(self, options: dict) -> dict:
+        scale = {} if options['current_db'] else self.generate(options)
+        contexts = self.get_contexts(options['pages'])
+        production = get_backend(cached=True)
+        development = get_backend(cached=False)
+        start = time.perf_counter()
+        precompiled = production.precompile(settings.TEMPLATES_PRECOMPILE)
+        precompile_ms = (time.perf_counter() - start) * 1000
+
+        renders = {}
+        for name, template_name in BENCH_TEMPLATES.items():
+            args = (template_name, contexts[name], options['renders'])
+            renders[f'{name}_cold'] = self.measure_renders(
+                production, *args, cold=True
+            )
+            renders[f'{name}_warm'] = self.measure_renders(production, *args)
+            renders[f'{name}_development'] = self.measure_renders(
+                development, *args
+            )
+        return {
+            'vendor': connection.vendor,
+            'scale': scale,
+            'renders_count': options['renders'],
+            'precompiled': len(precompiled),
+            'precompile_ms': precompile_ms,
+            'renders': renders,
+        }
+
+    def handle(self, *args, **options):
+        with throwaway_database(options['current_db']):
+            results = self.run(options)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2)
+        comparison = {}
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+            comparison = compare(
+                results['renders'], baseline['renders'], options['threshold']
+            )
+
+        if options['json']:
+            self.stdout.write(json.dumps(
+                {**results, 'comparison': comparison}, indent=2
+            ))
+        else:
+            self.write_report(results, comparison)
+        regressions = [
+            name for name, change in comparison.items()
+            if change['regression']
+        ]
+        if regressions:
+            raise CommandError(
+                f'p95 вырос больше чем на {options["threshold"]:.0%}: '
+                f'{", ".join(regressions)}.'
+            )
+
+    def write_report(self, results: dict, comparison: dict) -> None:
+        self.stdout.write(f'{results["vendor"]} {results["scale"]}')
+        self.stdout.write(
+            f'precompiled {results["precompiled"]} templates in '
+            f'{results["precompile_ms"]:.2f} ms'
+        )
+        for name, summary in results['renders'].items():
+            line = (
+                f'{name:>23}: p50 {summary["p50_ms"]:.2f} ms, '
+                f'p95 {summary["p95_ms"]:.2f} ms, '
+                f'{summary["rps"]:.0f} renders/s'
+            )
+            if name in comparison:
+                line += (
+                    f' (p50 {comparison[name]["p50_ms_change"]:+.0%}, '
+                    f'p95 {comparison[name]["p95_ms_change"]:+.0%})'
+                )
+            self.stdout.write(line)
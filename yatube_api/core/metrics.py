@@ -0,0 +1,183 @@
+"""
+Core app's per-view metrics: query count, SQL, serializer, template,
+thumbnail and total time of requests, aggregated by resolved view name.
+Queries of thumbnail generation are counted apart from the view's ones,
+because they only run once per image. Transaction control statements are
+timed but not counted, so tests, which wrap transactions in savepoints,
+count the same queries as production.
+
+Metrics are kept in the process memory, so every worker exports its own
+counters and Prometheus sums them up by scraping all the workers.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+DURATION_BUCKETS: tuple = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5
+)
+TIMERS: tuple = ('sql', 'serializer', 'template', 'thumbnail')
+TRANSACTION_STATEMENTS: tuple = (
+    'BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE SAVEPOINT',
+)
+
+_local = threading.local()
+_lock = threading.Lock()
+_views = defaultdict(lambda: {
+    'count': 0,
+    'buckets': [0] * len(DURATION_BUCKETS),
+    'total': 0.0,
+    'queries': 0,
+    'thumbnail_queries': 0,
+    'budget_exceeded': 0,
+    **{name: 0.0 for name in TIMERS},
+})
+
+
+class RequestMetrics:
+    """Metrics of the request being processed by the current thread."""
+
+    def __init__(self):
+        self.queries = 0
+        self.thumbnail_queries = 0
+        self.timers = dict.fromkeys(TIMERS, 0.0)
+        self.active_timers = set()
+        self.start = time.perf_counter()
+        self.total = 0.0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """Database execute wrapper, which counts and times queries."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if not sql.upper().startswith(TRANSACTION_STATEMENTS):
+                if 'thumbnail' in self.active_timers:
+                    self.thumbnail_queries += 1
+                else:
+                    self.queries += 1
+            self.timers['sql'] += time.perf_counter() - start
+
+    def finish(self) -> None:
+        self.total = time.perf_counter() - self.start
+
+
+def get_current() -> Optional[RequestMetrics]:
+    """Function returns metrics of the current request, if any."""
+    return getattr(_local, 'metrics', None)
+
+
+@contextmanager
+def collect():
+    """Context manager collects metrics of the current thread's request."""
+    metrics = RequestMetrics()
+    _local.metrics = metrics
+    try:
+        yield metrics
+    finally:
+        metrics.finish()
+        _local.metrics = None
+
+
+@contextmanager
+def timer(name: str):
+    """Context manager adds the block time to the current request's timer."""
+    metrics = get_current()
+    # nested timers of the same name are counted once
+    if metrics is None or name in metrics.active_timers:
+        yield
+        return
+    metrics.active_timers.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timers[name] += time.perf_counter() - start
+        metrics.active_timers.discard(name)
+
+
+def record(view_name: str, metrics: RequestMetrics,
+           budget_exceeded: bool = False) -> None:
+    """Function adds request metrics to the view's totals."""
+    with _lock:
+        view = _views[view_name]
+        view['count'] += 1
+        view['total'] += metrics.total
+        view['queries'] += metrics.queries
+        view['thumbnail_queries'] += metrics.thumbnail_queries
+        view['budget_exceeded'] += budget_exceeded
+        for name in TIMERS:
+            view[name] += metrics.timers[name]
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if metrics.total <= bound:
+                view['buckets'][index] += 1
+
+
+def reset() -> None:
+    """Function removes all recorded metrics."""
+    with _lock:
+        _views.clear()
+
+
+def get_server_timing(metrics: RequestMetrics) -> str:
+    """Function returns Server-Timing header value of the request."""
+    return ', '.join((
+        f'db;dur={metrics.timers["sql"] * 1000:.1f};'
+        f'desc="{metrics.queries} queries"',
+        f'serializer;dur={metrics.timers["serializer"] * 1000:.1f}',
+        f'template;dur={metrics.timers["template"] * 1000:.1f}',
+        f'thumbnail;dur={metrics.timers["thumbnail"] * 1000:.1f};'
+        f'desc="{metrics.thumbnail_queries} queries"',
+        f'total;dur={metrics.total * 1000:.1f}',
+    ))
+
+
+def export() -> str:
+    """Function returns recorded metrics in Prometheus text format."""
+    with _lock:
+        views = {
+            name: {**view, 'buckets': list(view['buckets'])}
+            for name, view in _views.items()
+        }
+    lines = [
+        '# HELP yatube_view_duration_seconds Request duration by view.',
+        '# TYPE yatube_view_duration_seconds histogram',
+    ]
+    for name, view in sorted(views.items()):
+        for bound, count in zip(DURATION_BUCKETS, view['buckets']):
+            lines.append(
+                f'yatube_view_duration_seconds_bucket'
+                f'{{view="{name}",le="{bound}"}} {count}'
+            )
+        lines.extend((
+            f'yatube_view_duration_seconds_bucket'
+            f'{{view="{name}",le="+Inf"}} {view["count"]}',
+            f'yatube_view_duration_seconds_sum{{view="{name}"}} '
+            f'{view["total"]:.6f}',
+            f'yatube_view_duration_seconds_count{{view="{name}"}} '
+            f'{view["count"]}',
+        ))
+    counters = (
+        ('queries_total', 'queries', 'SQL queries by view.'),
+        ('thumbnail_queries_total', 'thumbnail_queries',
+         'Thumbnail store SQL queries by view.'),
+        ('sql_seconds_total', 'sql', 'SQL time by view.'),
+        ('serializer_seconds_total', 'serializer',
+         'Serializer time by view.'),
+        ('template_seconds_total', 'template', 'Template time by view.'),
+        ('thumbnail_seconds_total', 'thumbnail', 'Thumbnail time by view.'),
+        ('query_budget_exceeded_total', 'budget_exceeded',
+         'Requests over the query budget by view.'),
+    )
+    for metric, field, help_text in counters:
+        lines.extend((
+            f'# HELP yatube_view_{metric} {help_text}',
+            f'# TYPE yatube_view_{metric} counter',
+        ))
+        lines.extend(
+            f'yatube_view_{metric}{{view="{name}"}} {view[field]}'
+            for name, view in sorted(views.items())
+        )
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,85 @@
+import logging
+from contextlib import ExitStack
+from typing import Optional
+from django.conf import settings
+from django.db import connections
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """View has run more SQL queries than its query budget."""
+
+
+def query_budget(budget: int):
+    """
+    Decorator declares max SQL queries count of the view-function
+    per request.
+    """
+    def decorator(view_func):
+        view_func.query_budget = budget
+        return view_func
+    return decorator
+
+
+def get_query_budget(request) -> Optional[int]:
+    """
+    Function returns query budget of the resolved view. View sets
+    declare `query_budget` as a number or as a dict by action name.
+    """
+    view_func = request.resolver_match.func
+    view_class = getattr(view_func, 'cls', None)
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        actions = getattr(view_func, 'actions', None) or {}
+        return budget.get(actions.get(request.method.lower()))
+    if budget is not None:
+        return budget
+    return getattr(view_func, 'query_budget', None)
+
+
+def is_internal_request(request) -> bool:
+    return request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS
+
+
+class MetricsMiddleware:
+    """
+    Middleware records query count, SQL, serializer, template and total
+    time of requests by view name and adds them to the Server-Timing header
+    of INTERNAL_IPS requests (of all requests with SERVER_TIMING_PUBLIC).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with metrics.collect() as request_metrics, ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(request_metrics.execute_wrapper)
+                )
+            response = self.get_response(request)
+
+        if settings.SERVER_TIMING_PUBLIC or is_internal_request(request):
+            response['Server-Timing'] = metrics.get_server_timing(
+                request_metrics
+            )
+        if request.resolver_match is None:
+            metrics.record('unresolved', request_metrics)
+            return response
+
+        view_name = request.resolver_match.view_name
+        budget = get_query_budget(request)
+        budget_exceeded = (budget is not None
+                           and request_metrics.queries > budget)
+        metrics.record(view_name, request_metrics, budget_exceeded)
+        if budget_exceeded:
+            message = (
+                f'{view_name} ran {request_metrics.queries} SQL queries, '
+                f'its query budget is {budget}'
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
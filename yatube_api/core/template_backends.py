@@ -0,0 +1,66 @@
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable
+from django.conf import settings
+from django.template import engines
+from django.template.backends import django
+from django.template.loaders import cached
+from . import metrics
+
+
+class Template(django.Template):
+    """Template, which render time is added to the request metrics."""
+
+    def render(self, context=None, request=None):
+        with metrics.timer('template'):
+            return super().render(context, request)
+
+
+class DjangoTemplates(django.DjangoTemplates):
+    """Django templates backend with timed templates."""
+
+    def from_string(self, template_code):
+        return Template(
+            super().from_string(template_code).template, self
+        )
+
+    def get_template(self, template_name):
+        return Template(
+            super().get_template(template_name).template, self
+        )
+
+    def get_template_names(self, patterns: Iterable) -> list:
+        """Method returns names of the loaders' templates matching patterns."""
+        patterns = list(patterns)
+        names = set()
+        for loader in self.engine.template_loaders:
+            for loader in getattr(loader, 'loaders', [loader]):
+                for directory in map(Path, loader.get_dirs()):
+                    for path in directory.rglob('*.html'):
+                        name = path.relative_to(directory).as_posix()
+                        if any(fnmatch(name, pattern) for pattern in patterns):
+                            names.add(name)
+        return sorted(names)
+
+    def precompile(self, patterns: Iterable) -> list:
+        """
+        Method compiles the templates matching patterns into the cached
+        loader and returns their names. Without the cached loader there
+        is nothing to keep, so nothing is compiled.
+        """
+        if not any(isinstance(loader, cached.Loader)
+                   for loader in self.engine.template_loaders):
+            return []
+        names = self.get_template_names(patterns)
+        for name in names:
+            self.engine.get_template(name)
+        return names
+
+
+def precompile_templates() -> list:
+    """Function precompiles TEMPLATES_PRECOMPILE templates of all engines."""
+    names = []
+    for engine in engines.all():
+        if isinstance(engine, DjangoTemplates):
+            names += engine.precompile(settings.TEMPLATES_PRECOMPILE)
+    return names
@@ -1,4 +1,28 @@
-from django.test import TestCase
+import datetime
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.core.cache import cache
+from django.db import connection
+from django.template import engines
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from api.views import PostViewSet
+from posts import views
+from posts.models import Post, User
+from posts.synthetic import Generator
+from . import metrics
+from .benchmarks import compare
+from .cache import etag_on_version
+from .context_processors.year import year
+from .db import close_unusable_connections
+from .middleware import QueryBudgetExceeded
+from .template_backends import precompile_templates
 
 
 class ViewTestClass(TestCase):
@@ -6,3 +30,244 @@ class ViewTestClass(TestCase):
         response = self.client.get('/nonexist-page/')
         self.assertEqual(response.status_code, 404)
         self.assertTemplateUsed(response, 'core/404.html')
+
+
+class PageCacheTestClass(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.post = Post.objects.create(text='Первый пост', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_page_cached(self):
+        url = reverse('posts:index')
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url)
+        self.assertEqual(response.content, cached_response.content)
+
+    def test_new_post_invalidates_page(self):
+        url = reverse('posts:index')
+        self.client.get(url)
+        Post.objects.create(text='Второй пост', author=self.user)
+        response = self.client.get(url)
+        self.assertContains(response, 'Второй пост')
+
+    def test_api_anonymous_response_cached(self):
+        url = '/api/v1/posts/'
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url)
+        self.assertEqual(response.json(), cached_response.json())
+
+    def test_authenticated_page_not_cached(self):
+        self.client.force_login(self.user)
+        url = reverse('posts:index')
+        self.client.get(url)
+        Post.objects.filter(pk=self.post.pk).update(text='Новый текст')
+        response = self.client.get(url)
+        self.assertContains(response, 'Новый текст')
+
+
+class ConditionalGetTestClass(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.post = Post.objects.create(text='Первый пост', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_not_modified(self):
+        urls = (
+            '/api/v1/posts/',
+            f'/api/v1/posts/{self.post.id}/comments/',
+            '/api/v1/groups/',
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+    def test_modified_after_change(self):
+        url = '/api/v1/posts/'
+        etag = self.client.get(url)['ETag']
+        Post.objects.create(text='Второй пост', author=self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_error_without_etag(self):
+        for status in (200, 404, 500):
+            with self.subTest(status=status):
+                view = etag_on_version()(
+                    lambda request: HttpResponse(status=status)
+                )
+                response = view(RequestFactory().get('/'))
+                self.assertEqual(response.has_header('ETag'), status == 200)
+
+
+class ConnectionHealthTestClass(TestCase):
+    def test_unusable_connection_closed(self):
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'is_usable', return_value=False):
+            with mock.patch.object(connection, 'close') as close:
+                close_unusable_connections()
+        close.assert_called_once()
+
+    def test_usable_connection_kept(self):
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'close') as close:
+            close_unusable_connections()
+        close.assert_not_called()
+
+
+class MetricsTestClass(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.post = Post.objects.create(text='Первый пост', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('posts:index'))
+        self.assertRegex(
+            response['Server-Timing'],
+            r'db;dur=[\d.]+;desc="\d+ queries", .*template;dur=[\d.]+'
+        )
+
+    def test_server_timing_internal_only(self):
+        url = reverse('posts:index')
+        response = self.client.get(url, REMOTE_ADDR='10.0.0.1')
+        self.assertFalse(response.has_header('Server-Timing'))
+        with override_settings(SERVER_TIMING_PUBLIC=True):
+            response = self.client.get(url, REMOTE_ADDR='10.0.0.1')
+        self.assertTrue(response.has_header('Server-Timing'))
+
+    def test_metrics_view(self):
+        self.client.get(reverse('posts:index'))
+        self.client.get('/api/v1/posts/')
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn(
+            'yatube_view_duration_seconds_count{view="posts:index"} 1',
+            content
+        )
+        self.assertIn('yatube_view_queries_total{view="post-list"}', content)
+
+        response = self.client.get(
+            reverse('metrics'), REMOTE_ADDR='10.0.0.1'
+        )
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_query_budget_strict(self):
+        with mock.patch.object(views.index, 'query_budget', 0):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('posts:index'))
+        with mock.patch.object(PostViewSet, 'query_budget', {'list': 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/api/v1/posts/')
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_query_budget_logged(self):
+        with mock.patch.object(views.index, 'query_budget', 0):
+            with self.assertLogs('core.middleware', 'WARNING'):
+                response = self.client.get(reverse('posts:index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'yatube_view_query_budget_exceeded_total{view="posts:index"} 1',
+            metrics.export()
+        )
+
+
+class BenchmarksTestClass(TestCase):
+    def test_compare(self):
+        baseline = {
+            'index': {'p50_ms': 10, 'p95_ms': 20, 'rps': 100},
+            'removed': {'p50_ms': 1, 'p95_ms': 1, 'rps': 1},
+        }
+        results = {
+            'index': {'p50_ms': 11, 'p95_ms': 30, 'rps': 90},
+            'added': {'p50_ms': 1, 'p95_ms': 1, 'rps': 1},
+        }
+        comparison = compare(results, baseline, threshold=0.2)
+        self.assertEqual(list(comparison), ['index'])
+        self.assertAlmostEqual(comparison['index']['p95_ms_change'], 0.5)
+        self.assertTrue(comparison['index']['regression'])
+        self.assertFalse(
+            compare(results, baseline, threshold=1)['index']['regression']
+        )
+
+    def test_bench_suite(self):
+        Generator(
+            users=5, groups=1, posts=20, comments=10, follows=1
+        ).generate()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'results.json')
+        call_command(
+            'bench_suite', current_db=True, requests=2, output=path,
+            stdout=StringIO()
+        )
+        with open(path, encoding='utf-8') as file:
+            results = json.load(file)
+        self.assertEqual(set(results['endpoints']), {
+            'index', 'follow_index', 'post_detail', 'api_posts',
+            'api_follow', 'jwt_create', 'jwt_refresh', 'jwt_verify'
+        })
+        self.assertEqual(results['endpoints']['index']['count'], 2)
+
+        for summary in results['endpoints'].values():
+            summary['p95_ms'] /= 100
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(results, file)
+        with self.assertRaises(CommandError):
+            call_command(
+                'bench_suite', current_db=True, requests=2, baseline=path,
+                stdout=StringIO()
+            )
+
+    def test_bench_templates(self):
+        Generator(
+            users=5, groups=1, posts=20, comments=10, follows=1
+        ).generate()
+        stdout = StringIO()
+        call_command(
+            'bench_templates', current_db=True, pages=2, renders=2,
+            json=True, stdout=stdout
+        )
+        results = json.loads(stdout.getvalue())
+        self.assertEqual(set(results['renders']), {
+            f'{name}_{variant}'
+            for name in ('index', 'post_detail')
+            for variant in ('cold', 'warm', 'development')
+        })
+        for summary in results['renders'].values():
+            self.assertEqual(summary['count'], 2)
+        self.assertGreater(results['precompiled'], 0)
+
+
+class TemplatesTestClass(TestCase):
+    def test_precompile_templates(self):
+        names = precompile_templates()
+        self.assertIn('posts/index.html', names)
+        self.assertIn('includes/post_card.html', names)
+        self.assertNotIn('users/login.html', names)
+        loader = engines.all()[0].engine.template_loaders[0]
+        self.assertIn('posts/index.html', loader.get_template_cache)
+
+    def test_year_lazy(self):
+        with mock.patch('core.context_processors.year.date') as date:
+            date.today.return_value = datetime.date(2022, 8, 13)
+            context = year(None)
+            date.today.assert_not_called()
+            self.assertEqual(str(context['year']), '2022')
@@ -1,4 +1,8 @@
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
 from django.shortcuts import render
+from . import metrics
+from .middleware import is_internal_request
 
 
 def csrf_failure(request, reason=''):
@@ -15,3 +19,16 @@ def server_error(request):
 
 def permission_denied(request, exception):
     return render(request, 'core/403.html', status=403)
+
+
+def metrics_view(request):
+    """
+    Prometheus metrics view-function, available from INTERNAL_IPS.
+    Behind a reverse proxy REMOTE_ADDR is the proxy's address, so the
+    proxy must not pass /metrics/ requests from outside.
+    """
+    if not is_internal_request(request):
+        raise PermissionDenied
+    return HttpResponse(
+        metrics.export(), content_type='text/plain; version=0.0.4'
+    )
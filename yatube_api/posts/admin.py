@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import SEARCH_VAR
 from .models import Post, Group, Comment, Follow
+from .search import SEARCH_ORDERING, get_words, search_posts
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -11,6 +13,16 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
+    def get_ordering(self, request):
+        if get_words(request.GET.get(SEARCH_VAR, '')):
+            return SEARCH_ORDERING
+        return super().get_ordering(request)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
 
 class GroupAdmin(admin.ModelAdmin):
     """Admin class for model class Group."""
@@ -0,0 +1,107 @@
+"""
+Posts app's bulk creation functions.
+"""
+from django.db import connection, transaction
+from core.cache import PAGES_NAMESPACE, bump_version
+from .models import Comment, Follow, Post
+from .signals import (
+    comments_created, follows_created, follows_deleted, posts_created
+)
+
+
+def bulk_create(model, objs: list, created_callback) -> list:
+    """
+    Function inserts objects in one transaction and updates denormalized
+    data. Backends, which can't return ids from a bulk insert, save the
+    objects one by one within the same transaction, except SQLite.
+    """
+    with transaction.atomic():
+        if connection.features.can_return_ids_from_bulk_insert:
+            model.objects.bulk_create(objs)
+        elif connection.vendor == 'sqlite':
+            model.objects.bulk_create(objs)
+            set_inserted_ids(model, objs)
+        else:
+            for obj in objs:
+                obj.save(force_insert=True)
+            return objs
+        created_callback(objs)
+    bump_version(PAGES_NAMESPACE)
+    return objs
+
+
+def set_inserted_ids(model, objs: list) -> None:
+    """
+    Function sets ids of just inserted objects by reading the last ids.
+    SQLite holds the database write lock till the transaction ends and
+    gives increasing ids, so the last len(objs) ids are the objects' ones.
+    """
+    ids = list(
+        model.objects.order_by('-pk')
+        .values_list('pk', flat=True)[:len(objs)]
+    )
+    for obj, pk in zip(objs, reversed(ids)):
+        obj.pk = pk
+
+
+def bulk_create_posts(posts: list) -> list:
+    """Function inserts posts in bulk."""
+    return bulk_create(Post, posts, posts_created)
+
+
+def bulk_create_comments(comments: list) -> list:
+    """Function inserts comments in bulk."""
+    return bulk_create(Comment, comments, comments_created)
+
+
+def bulk_follow(user_id: int, following_ids: list) -> list:
+    """
+    Function follows the authors, returns ids of newly followed ones.
+    Ids are returned by the INSERT itself (RETURNING, SQLite 3.35+), so
+    follows inserted by a concurrent request aren't counted twice.
+    """
+    following_ids = [
+        pk for pk in dict.fromkeys(following_ids) if pk != user_id
+    ]
+    if not following_ids:
+        return []
+    ops = connection.ops
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'{ops.insert_statement(ignore_conflicts=True)} '
+            f'{Follow._meta.db_table} (user_id, following_id) VALUES '
+            f'{", ".join(["(%s, %s)"] * len(following_ids))} '
+            f'{ops.ignore_conflicts_suffix_sql(ignore_conflicts=True)} '
+            f'RETURNING following_id',
+            [value for pk in following_ids for value in (user_id, pk)]
+        )
+        created_ids = {row[0] for row in cursor.fetchall()}
+        new_ids = [pk for pk in following_ids if pk in created_ids]
+        follows_created(user_id, new_ids)
+    bump_version(PAGES_NAMESPACE)
+    return new_ids
+
+
+def bulk_unfollow(user_id: int, following_ids: list) -> list:
+    """
+    Function unfollows the authors, returns ids of unfollowed ones.
+    Ids are returned by the DELETE itself, so follows deleted by
+    a concurrent request aren't counted twice.
+    """
+    following_ids = list(dict.fromkeys(following_ids))
+    if not following_ids:
+        return []
+    with transaction.atomic(), connection.cursor() as cursor:
+        # QuerySet.delete() would send post_delete for every follow
+        cursor.execute(
+            f'DELETE FROM {Follow._meta.db_table} '
+            f'WHERE user_id = %s AND following_id IN '
+            f'({", ".join(["%s"] * len(following_ids))}) '
+            f'RETURNING following_id',
+            [user_id, *following_ids]
+        )
+        deleted_ids = {row[0] for row in cursor.fetchall()}
+        removed_ids = [pk for pk in following_ids if pk in deleted_ids]
+        follows_deleted(user_id, removed_ids)
+    bump_version(PAGES_NAMESPACE)
+    return removed_ids
@@ -0,0 +1,68 @@
+"""
+Posts app's denormalized counters functions.
+"""
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import Comment, Follow, Group, Post, User, UserStats
+
+
+def change(model, pk: int, **deltas) -> None:
+    """Function atomically changes counters of the object by deltas."""
+    if pk is None:
+        return
+    change_all(model, [pk], **deltas)
+
+
+def change_all(model, pks, **deltas) -> None:
+    """
+    Function atomically changes counters of the objects by deltas.
+    Counters never go below zero, even if they have drifted.
+    """
+    queryset = model.objects.filter(pk__in=pks).filter(**{
+        f'{field}__gte': -delta
+        for field, delta in deltas.items() if delta < 0
+    })
+    queryset.update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+def change_user(user_id: int, **deltas) -> None:
+    """Function atomically changes user's counters by deltas."""
+    change(UserStats, user_id, **deltas)
+
+
+def count_subquery(queryset, field: str) -> Coalesce:
+    """Function returns correlated rows count subquery by field."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0
+    )
+
+
+@transaction.atomic
+def recount() -> None:
+    """Function recomputes all counters from the source tables."""
+    UserStats.objects.bulk_create(
+        [UserStats(user_id=pk) for pk in User.objects.filter(
+            stats__isnull=True
+        ).values_list('pk', flat=True)],
+        ignore_conflicts=True
+    )
+    Group.objects.update(posts_count=count_subquery(Post.objects, 'group'))
+    Post.objects.update(
+        comments_count=count_subquery(Comment.objects, 'post')
+    )
+    UserStats.objects.update(
+        posts_count=count_subquery(Post.objects, 'author'),
+        comments_count=count_subquery(Comment.objects, 'author'),
+        followers_count=count_subquery(Follow.objects, 'following'),
+        following_count=count_subquery(Follow.objects, 'user'),
+    )
@@ -0,0 +1,115 @@
+"""
+Posts app's streaming export of posts and comments as NDJSON or CSV.
+
+Rows are read with a server-side cursor (QuerySet.iterator), so memory
+use doesn't depend on the table size. Transaction pooling disables
+server-side cursors, and then rows are read in keyset batches.
+"""
+import csv
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .models import Comment, Post
+
+EXPORT_CHUNK_SIZE: int = 2000
+EXPORT_FORMATS: dict = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+# Exported columns and their model fields, date field of since/until
+EXPORTS: dict = {
+    'posts': (Post, {
+        'id': 'id',
+        'author': 'author__username',
+        'group': 'group__slug',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'image': 'image',
+    }, 'pub_date'),
+    'comments': (Comment, {
+        'id': 'id',
+        'post': 'post_id',
+        'author': 'author__username',
+        'text': 'text',
+        'created': 'created',
+    }, 'created'),
+}
+
+
+def parse_moment(value: str) -> datetime:
+    """Function parses ISO date or datetime, raises ValueError if invalid."""
+    moment = parse_datetime(value)
+    if moment is None:
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(f'Неверный формат даты: {value}')
+        moment = datetime.combine(date, datetime.min.time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def get_export_queryset(name: str, since: Optional[str] = None,
+                        until: Optional[str] = None) -> QuerySet:
+    """Function returns rows of the export ordered by id."""
+    model, columns, date_field = EXPORTS[name]
+    queryset = model.objects.order_by('id')
+    if since:
+        queryset = queryset.filter(
+            **{f'{date_field}__gte': parse_moment(since)}
+        )
+    if until:
+        queryset = queryset.filter(
+            **{f'{date_field}__lt': parse_moment(until)}
+        )
+    return queryset.values_list(*columns.values())
+
+
+def iter_rows(queryset: QuerySet,
+              chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[tuple]:
+    """Function yields rows with a constant memory use."""
+    settings_dict = connections[queryset.db].settings_dict
+    if not settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][0]
+
+
+def to_text(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class Echo:
+    """File-like object, which returns the written line."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_export(name: str, output: str, queryset: QuerySet,
+                chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Function yields export lines in the output format."""
+    columns = list(EXPORTS[name][1])
+    rows = iter_rows(queryset, chunk_size)
+    if output == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([to_text(value) for value in row])
+        return
+    for row in rows:
+        yield json.dumps(
+            dict(zip(columns, map(to_text, row))), ensure_ascii=False
+        ) + '\n'
@@ -0,0 +1,157 @@
+"""
+Posts app's follow-feed functions.
+
+Posts are fanned out to the followers' FeedItem rows when they are created.
+Authors with more than FEED_FANOUT_MAX_FOLLOWERS followers are not fanned
+out: their posts are merged into the feed at read time instead. When
+such an author drops back to the limit, the latest posts are backfilled
+to the followers' feeds, as they are for a new follow and by a rebuild.
+"""
+from typing import Optional
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from .models import FeedItem, Follow, Post, UserStats
+from . import utils
+
+
+def get_fanout_limit() -> int:
+    """Function returns max followers count for fan-out on write."""
+    return settings.FEED_FANOUT_MAX_FOLLOWERS
+
+
+def get_followers_ids(author_id: int) -> Optional[list]:
+    """
+    Function returns followers ids of the author or None,
+    if the author has too many followers for fan-out on write.
+    """
+    limit = get_fanout_limit()
+    followers_ids = list(
+        Follow.objects.filter(following_id=author_id)
+        .values_list('user_id', flat=True)[:limit + 1]
+    )
+    if len(followers_ids) > limit:
+        return None
+    return followers_ids
+
+
+def fan_out(posts) -> None:
+    """Function adds posts to the feeds of their authors' followers."""
+    followers_by_author = {}
+    items = []
+    for post in posts:
+        if post.author_id not in followers_by_author:
+            followers_by_author[post.author_id] = get_followers_ids(
+                post.author_id
+            )
+        followers_ids = followers_by_author[post.author_id] or []
+        items.extend(
+            FeedItem(user_id=user_id, post_id=post.id)
+            for user_id in followers_ids
+        )
+    FeedItem.objects.bulk_create(items, ignore_conflicts=True)
+
+
+def add_latest_posts(authors_ids: Optional[list] = None,
+                     user_id: Optional[int] = None) -> None:
+    """
+    Function adds up to FEED_BACKFILL_SIZE latest posts of every fanned
+    out author to the feeds of the author's followers by one INSERT ...
+    SELECT. Authors and followers are all ones, unless given.
+    """
+    if authors_ids is not None and not authors_ids:
+        return
+    authors_sql, follows_sql, params = '', '', [get_fanout_limit()]
+    if authors_ids is not None:
+        authors_sql = (
+            f'AND post.author_id IN ({", ".join(["%s"] * len(authors_ids))})'
+        )
+        params += authors_ids
+    params.append(settings.FEED_BACKFILL_SIZE)
+    if user_id is not None:
+        follows_sql = 'AND follow.user_id = %s'
+        params.append(user_id)
+    ops = connection.ops
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'{ops.insert_statement(ignore_conflicts=True)} '
+            f'{FeedItem._meta.db_table} (user_id, post_id) '
+            f'SELECT follow.user_id, latest.id '
+            f'FROM {Follow._meta.db_table} follow INNER JOIN ('
+            f'SELECT post.id, post.author_id, ROW_NUMBER() OVER ('
+            f'PARTITION BY post.author_id '
+            f'ORDER BY post.pub_date DESC, post.id DESC) AS position '
+            f'FROM {Post._meta.db_table} post '
+            f'LEFT JOIN {UserStats._meta.db_table} stats '
+            f'ON stats.user_id = post.author_id '
+            f'WHERE COALESCE(stats.followers_count, 0) <= %s {authors_sql}'
+            f') latest ON latest.author_id = follow.following_id '
+            f'WHERE latest.position <= %s {follows_sql} '
+            f'{ops.ignore_conflicts_suffix_sql(ignore_conflicts=True)}',
+            params
+        )
+
+
+def backfill(user_id: int, author_id: int) -> None:
+    """Function adds latest author's posts to the feed of a new follower."""
+    add_latest_posts([author_id], user_id)
+
+
+def backfill_authors(user_id: int, authors_ids) -> None:
+    """Function adds latest posts of the authors to the feed of a follower."""
+    add_latest_posts(list(authors_ids), user_id)
+
+
+def backfill_unpopular(authors_ids) -> None:
+    """
+    Function adds latest posts of the authors, who have just dropped to
+    the fan-out limit, to all their followers' feeds. Posts written while
+    the authors were read on the fly have no feed items.
+    """
+    unpopular_ids = list(
+        UserStats.objects.filter(
+            user_id__in=authors_ids, followers_count=get_fanout_limit()
+        ).values_list('user_id', flat=True)
+    )
+    add_latest_posts(unpopular_ids)
+
+
+def remove(user_id: int, author_id: int) -> None:
+    """Function removes author's posts from the feed of a former follower."""
+    remove_authors(user_id, [author_id])
+
+
+def remove_authors(user_id: int, authors_ids) -> None:
+    """Function removes authors' posts from the feed of a former follower."""
+    FeedItem.objects.filter(
+        user_id=user_id, post__author_id__in=authors_ids
+    ).delete()
+
+
+def get_feed(user) -> QuerySet:
+    """
+    Function returns the user's follow-feed: materialized posts
+    and posts of followed authors with too many followers.
+    """
+    fanout_skipped_ids = list(
+        Follow.objects.filter(
+            user=user,
+            following__stats__followers_count__gt=get_fanout_limit()
+        )
+        .values_list('following_id', flat=True)
+    )
+    condition = Q(id__in=FeedItem.objects.filter(user=user).values('post_id'))
+    if fanout_skipped_ids:
+        condition |= Q(author_id__in=fanout_skipped_ids)
+    return utils.get_posts_list(condition)
+
+
+def rebuild_feed() -> None:
+    """
+    Function rebuilds all feeds from the Follow and Post tables with
+    the same FEED_BACKFILL_SIZE latest posts per author as a new follow.
+    """
+    with transaction.atomic():
+        FeedItem.objects.all().delete()
+        add_latest_posts()
@@ -0,0 +1,127 @@
+"""
+Posts app's follow-graph functions over cached adjacency sets.
+
+Ids of the authors followed by a user and of the user's followers are
+cached per user for FOLLOW_GRAPH_TTL seconds. Keys of a changed follow
+are deleted by the Follow signals and the bulk follow functions, when
+the transaction commits, and bumping GRAPH_NAMESPACE (bulk import) drops
+the whole graph at once. Keys are only deleted in the cache of the
+deleting process, so multi-worker deployments need a shared cache.
+"""
+from collections import Counter
+from typing import Iterable
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from core.cache import get_version
+from .models import Follow
+
+GRAPH_NAMESPACE: str = 'graph'
+FOLLOWING: str = 'following'
+FOLLOWERS: str = 'followers'
+# Followed authors, whose follows are used for suggestions
+SUGGESTIONS_SAMPLE: int = 200
+SUGGESTIONS_LIMIT: int = 20
+
+
+def get_key(direction: str, user_id: int, version: int) -> str:
+    return f'graph:{version}:{direction}:{user_id}'
+
+
+def get_sets(direction: str, users_ids: Iterable) -> dict:
+    """
+    Function returns sets of followed authors (FOLLOWING) or followers
+    (FOLLOWERS) ids by user id. Missed sets are read by one query.
+    """
+    users_ids = list(dict.fromkeys(users_ids))
+    if not users_ids:
+        return {}
+    version = get_version(GRAPH_NAMESPACE)
+    keys = {user_id: get_key(direction, user_id, version)
+            for user_id in users_ids}
+    cached = cache.get_many(keys.values())
+    sets = {user_id: cached[key] for user_id, key in keys.items()
+            if key in cached}
+    missed_ids = [user_id for user_id in users_ids if user_id not in sets]
+    if missed_ids:
+        user_field, other_field = (
+            ('user_id', 'following_id') if direction == FOLLOWING
+            else ('following_id', 'user_id')
+        )
+        loaded = {user_id: set() for user_id in missed_ids}
+        for user_id, other_id in Follow.objects.filter(
+            **{f'{user_field}__in': missed_ids}
+        ).values_list(user_field, other_field):
+            loaded[user_id].add(other_id)
+        loaded = {user_id: frozenset(ids) for user_id, ids in loaded.items()}
+        cache.set_many(
+            {keys[user_id]: ids for user_id, ids in loaded.items()},
+            settings.FOLLOW_GRAPH_TTL
+        )
+        sets.update(loaded)
+    return sets
+
+
+def get_following_ids(user_id: int) -> frozenset:
+    """Function returns ids of the authors followed by the user."""
+    return get_sets(FOLLOWING, [user_id])[user_id]
+
+
+def get_followers_ids(user_id: int) -> frozenset:
+    """Function returns ids of the user's followers."""
+    return get_sets(FOLLOWERS, [user_id])[user_id]
+
+
+def is_following(user_id: int, authors_ids: Iterable) -> dict:
+    """Function returns whether the user follows the authors by their ids."""
+    following_ids = get_following_ids(user_id)
+    return {author_id: author_id in following_ids
+            for author_id in authors_ids}
+
+
+def invalidate(user_id: int, following_ids: Iterable) -> None:
+    """
+    Function drops sets, which changed by the user's follows, when the
+    current transaction commits. Sets read by concurrent requests before
+    the commit would be cached again, if they were dropped earlier.
+    """
+    following_ids = list(following_ids)
+    transaction.on_commit(lambda: delete_sets(user_id, following_ids))
+
+
+def delete_sets(user_id: int, following_ids: list) -> None:
+    """Function drops the user's followed and the authors' followers sets."""
+    version = get_version(GRAPH_NAMESPACE)
+    cache.delete_many([
+        get_key(FOLLOWING, user_id, version),
+        *(get_key(FOLLOWERS, following_id, version)
+          for following_id in following_ids)
+    ])
+
+
+def invalidate_user(user_id: int) -> None:
+    """Function drops both sets of the user, e.g. of a reused id."""
+    version = get_version(GRAPH_NAMESPACE)
+    cache.delete_many([
+        get_key(FOLLOWING, user_id, version),
+        get_key(FOLLOWERS, user_id, version),
+    ])
+
+
+def get_suggestions(user_id: int, limit: int = SUGGESTIONS_LIMIT) -> list:
+    """
+    Function returns (author id, count) pairs of authors followed by
+    count of the authors the user follows (friends-of-friends),
+    most often followed first.
+    """
+    following_ids = get_following_ids(user_id)
+    sample = sorted(following_ids)[:SUGGESTIONS_SAMPLE]
+    counts = Counter()
+    for ids in get_sets(FOLLOWING, sample).values():
+        counts.update(ids)
+    candidates = [
+        (count, author_id) for author_id, count in counts.items()
+        if author_id != user_id and author_id not in following_ids
+    ]
+    candidates.sort(key=lambda item: (-item[0], item[1]))
+    return [(author_id, count) for count, author_id in candidates[:limit]]
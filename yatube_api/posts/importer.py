@@ -0,0 +1,239 @@
+"""
+Posts app's bulk import of groups, posts, comments and follows from NDJSON
+or CSV files in the export_data format.
+
+Usernames, slugs and post ids are resolved through in-memory maps and rows
+are inserted in batches in one transaction: groups and follows by
+bulk_create, posts and comments by plain INSERTs, which keep their dates
+instead of applying auto_now_add. Neither sends model signals, so
+counters, follow-feeds and the search index are rebuilt once after the
+import.
+"""
+import csv
+import json
+from collections import Counter
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+from core.cache import PAGES_NAMESPACE, bump_version
+from .export import parse_moment
+from .models import Comment, Follow, Group, Post, User, UserStats
+from . import counters, feed, graph, search
+
+IMPORT_BATCH_SIZE: int = 5000
+IMPORT_ORDER: tuple = ('groups', 'posts', 'comments', 'follows')
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    """Function yields rows of CSV (by extension) or NDJSON file."""
+    with open(path, encoding='utf-8', newline='') as file:
+        if path.endswith('.csv'):
+            yield from csv.DictReader(file)
+            return
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def batched(rows: Iterable, size: int) -> Iterator[list]:
+    """Function yields lists of size rows."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def insert_objects(model, objs: list) -> None:
+    """
+    Function inserts objects with their fields values as they are.
+    Unlike bulk_create, fields pre_save isn't called, so auto_now_add
+    dates of the objects are kept.
+    """
+    opts = model._meta
+    for with_pk in (True, False):
+        part = [obj for obj in objs if (obj.pk is not None) == with_pk]
+        if not part:
+            continue
+        fields = [
+            field for field in opts.concrete_fields
+            if with_pk or field is not opts.auto_field
+        ]
+        columns = ', '.join(
+            connection.ops.quote_name(field.column) for field in fields
+        )
+        row_sql = f'({", ".join(["%s"] * len(fields))})'
+        size = max(connection.ops.bulk_batch_size(fields, part), 1)
+        with connection.cursor() as cursor:
+            for batch in batched(part, size):
+                cursor.execute(
+                    f'INSERT INTO {opts.db_table} ({columns}) '
+                    f'VALUES {", ".join([row_sql] * len(batch))}',
+                    [field.get_db_prep_save(
+                        getattr(obj, field.attname), connection
+                    ) for obj in batch for field in fields]
+                )
+
+
+class Importer:
+    """Loads rows of the models and rebuilds the denormalized data."""
+
+    def __init__(self, batch_size: int = IMPORT_BATCH_SIZE,
+                 create_users: bool = True):
+        self.batch_size = batch_size
+        self.create_users = create_users
+        self.users = dict(User.objects.values_list('username', 'id'))
+        self.groups = dict(Group.objects.values_list('slug', 'id'))
+        self.post_ids = set(Post.objects.values_list('id', flat=True))
+        self.follows = set(
+            Follow.objects.values_list('user_id', 'following_id')
+        )
+        self.imported = Counter()
+        self.skipped = Counter()
+
+    def add_users(self, usernames: Iterable) -> None:
+        """Method creates users, which aren't in the users map."""
+        new = {name for name in usernames if name and name not in self.users}
+        if not new or not self.create_users:
+            return
+        User.objects.bulk_create(
+            [User(username=name, password=make_password(None))
+             for name in new]
+        )
+        new_users = dict(
+            User.objects.filter(username__in=new)
+            .values_list('username', 'id')
+        )
+        # bulk_create doesn't send post_save, which creates users' stats
+        UserStats.objects.bulk_create(
+            [UserStats(user_id=pk) for pk in new_users.values()]
+        )
+        self.users.update(new_users)
+
+    def get_date(self, value: Optional[str]):
+        return parse_moment(value) if value else timezone.now()
+
+    def build_group(self, row: dict) -> Optional[Group]:
+        if not row.get('slug') or row['slug'] in self.groups:
+            return None
+        return Group(
+            title=row.get('title') or row['slug'],
+            slug=row['slug'],
+            description=row.get('description') or ''
+        )
+
+    def build_post(self, row: dict) -> Optional[Post]:
+        post_id = int(row['id']) if row.get('id') else None
+        group_slug = row.get('group')
+        if (post_id in self.post_ids
+                or row.get('author') not in self.users
+                or group_slug and group_slug not in self.groups):
+            return None
+        if post_id is not None:
+            self.post_ids.add(post_id)
+        return Post(
+            id=post_id,
+            text=row['text'],
+            author_id=self.users[row['author']],
+            group_id=self.groups.get(group_slug),
+            pub_date=self.get_date(row.get('pub_date')),
+            updated=timezone.now(),
+            image=row.get('image') or ''
+        )
+
+    def build_comment(self, row: dict) -> Optional[Comment]:
+        post_id = int(row['post']) if row.get('post') else None
+        if (post_id not in self.post_ids
+                or row.get('author') not in self.users):
+            return None
+        # comments aren't referenced, so they get new ids
+        return Comment(
+            post_id=post_id,
+            author_id=self.users[row['author']],
+            text=row['text'],
+            created=self.get_date(row.get('created'))
+        )
+
+    def build_follow(self, row: dict) -> Optional[Follow]:
+        user_id = self.users.get(row.get('user'))
+        following_id = self.users.get(row.get('following'))
+        if (user_id is None or following_id in (None, user_id)
+                or (user_id, following_id) in self.follows):
+            return None
+        self.follows.add((user_id, following_id))
+        return Follow(user_id=user_id, following_id=following_id)
+
+    def load(self, name: str, rows: Iterable[dict]) -> None:
+        """Method inserts rows of the model in batches."""
+        model, build = {
+            'groups': (Group, self.build_group),
+            'posts': (Post, self.build_post),
+            'comments': (Comment, self.build_comment),
+            'follows': (Follow, self.build_follow),
+        }[name]
+        for batch in batched(rows, self.batch_size):
+            self.add_users(
+                row.get(field) for row in batch
+                for field in ('author', 'user', 'following')
+            )
+            objs = []
+            for row in batch:
+                try:
+                    obj = build(row)
+                except (KeyError, ValueError):
+                    obj = None
+                if obj is None:
+                    self.skipped[name] += 1
+                else:
+                    objs.append(obj)
+            if model in (Post, Comment):
+                insert_objects(model, objs)
+            else:
+                model.objects.bulk_create(objs)
+            self.imported[name] += len(objs)
+            if model is Group:
+                self.groups.update(
+                    (group.slug, group.id) for group in Group.objects.filter(
+                        slug__in=[group.slug for group in objs]
+                    )
+                )
+
+    def rebuild(self) -> None:
+        """Method resets id sequences and rebuilds denormalized data."""
+        sequences_sql = connection.ops.sequence_reset_sql(
+            no_style(), [Group, Post, Comment, Follow]
+        )
+        with connection.cursor() as cursor:
+            for sql in sequences_sql:
+                cursor.execute(sql)
+        counters.recount()
+        feed.rebuild_feed()
+        search.rebuild_index()
+
+
+def import_rows(rows: dict, **options) -> Importer:
+    """
+    Function imports iterables of rows of the models (by IMPORT_ORDER
+    names) in one transaction.
+    """
+    importer = Importer(**options)
+    with transaction.atomic():
+        for name in IMPORT_ORDER:
+            if rows.get(name) is not None:
+                importer.load(name, rows[name])
+        if any(importer.imported.values()):
+            importer.rebuild()
+    bump_version(PAGES_NAMESPACE)
+    bump_version(graph.GRAPH_NAMESPACE)
+    return importer
+
+
+def import_files(paths: dict, **options) -> Importer:
+    """Function imports files of the models (by IMPORT_ORDER names)."""
+    return import_rows({
+        name: read_rows(path) for name, path in paths.items() if path
+    }, **options)
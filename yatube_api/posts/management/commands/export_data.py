@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from posts.export import (
+    EXPORT_CHUNK_SIZE, EXPORT_FORMATS, EXPORTS, get_export_queryset,
+    iter_export
+)
+
+
+class Command(BaseCommand):
+    help = 'Streams posts or comments as NDJSON or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=list(EXPORTS))
+        parser.add_argument(
+            '--output', choices=list(EXPORT_FORMATS), default='ndjson'
+        )
+        parser.add_argument('--since', help='ISO date or datetime.')
+        parser.add_argument('--until', help='ISO date or datetime.')
+        parser.add_argument('--file', help='Output file, stdout if omitted.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        try:
+            queryset = get_export_queryset(
+                options['name'], options['since'], options['until']
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        lines = iter_export(
+            options['name'], options['output'], queryset,
+            options['chunk_size']
+        )
+        if not options['file']:
+            self.stdout.writelines(lines)
+            return
+        with open(options['file'], 'w', encoding='utf-8', newline='') as f:
+            f.writelines(lines)
@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from posts.models import Post
+from posts.thumbnails import generate_post_thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Generates thumbnails of existing posts images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Number of generating threads.'
+        )
+
+    def handle(self, *args, **options):
+        posts_ids = (
+            Post.objects.exclude(image='').exclude(image__isnull=True)
+            .values_list('id', flat=True).iterator()
+        )
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            count = sum(
+                1 for _ in executor.map(generate_post_thumbnails, posts_ids)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'Thumbnails generated for {count} posts.')
+        )
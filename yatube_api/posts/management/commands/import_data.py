@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand
+from posts.importer import IMPORT_BATCH_SIZE, IMPORT_ORDER, import_files
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports groups, posts, comments and follows from NDJSON or CSV '
+        'files (export_data format) and rebuilds counters, follow-feeds '
+        'and the search index.'
+    )
+
+    def add_arguments(self, parser):
+        for name in IMPORT_ORDER:
+            parser.add_argument(f'--{name}', help=f'File of {name}.')
+        parser.add_argument(
+            '--batch-size', type=int, default=IMPORT_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--no-create-users', action='store_false', dest='create_users',
+            help='Skip rows of unknown users instead of creating them.'
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        importer = import_files(
+            {name: options[name] for name in IMPORT_ORDER},
+            batch_size=options['batch_size'],
+            create_users=options['create_users']
+        )
+        seconds = time.perf_counter() - start
+        total = sum(importer.imported.values())
+        for name in IMPORT_ORDER:
+            self.stdout.write(
+                f'{name}: {importer.imported[name]} imported, '
+                f'{importer.skipped[name]} skipped'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} rows in {seconds:.1f} s '
+            f'({total / seconds:.0f} rows/s).'
+        ))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from posts.feed import rebuild_feed
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds materialized follow-feeds from follows and posts.'
+
+    def handle(self, *args, **options):
+        rebuild_feed()
+        self.stdout.write(self.style.SUCCESS('Follow-feeds rebuilt.'))
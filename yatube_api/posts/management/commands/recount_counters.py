@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from posts.counters import recount
+
+
+class Command(BaseCommand):
+    help = 'Recomputes denormalized posts, comments and followers counters.'
+
+    def handle(self, *args, **options):
+        recount()
+        self.stdout.write(self.style.SUCCESS('Counters recomputed.'))
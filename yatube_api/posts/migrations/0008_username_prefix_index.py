@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import migrations
+
+USERNAME_INDEX = 'auth_user_username_prefix_idx'
+
+
+def create_username_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    # the expressions of istartswith lookups, so the prefix is a range scan
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {USERNAME_INDEX} ON {table} '
+            f'(UPPER(username::text) text_pattern_ops)'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE INDEX {USERNAME_INDEX} ON {table} '
+            f'(username COLLATE NOCASE)'
+        )
+
+
+def drop_username_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {USERNAME_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0007_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_username_index, drop_username_index),
+    ]
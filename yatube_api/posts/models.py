@@ -14,6 +14,8 @@ class Group(models.Model):
         'Адрес', max_length=50, db_index=True, unique=True
     )
     description: str = models.TextField('Описание')
+    posts_count = models.PositiveIntegerField(
+        'Количество постов', default=0, editable=False)
 
     class Meta:
         verbose_name = 'Сообщество'
@@ -28,6 +30,8 @@ class Post(models.Model):
 
     text = models.TextField('Текст')
     pub_date = models.DateTimeField('Дата публикации', auto_now_add=True)
+    # Version of the cached post fragments, changes on every save
+    updated = models.DateTimeField('Дата изменения', auto_now=True)
     group = models.ForeignKey(
         Group,
         verbose_name='Сообщество',
@@ -39,11 +43,26 @@ class Post(models.Model):
         User, on_delete=models.CASCADE, verbose_name='Автор')
     image = models.ImageField(
         'Картинка', upload_to='posts/', null=True, blank=True)
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0, editable=False)
 
     class Meta:
         default_related_name = 'posts'
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
+        indexes = [
+            models.Index(
+                fields=('-pub_date', '-id'), name='post_pub_date_id_idx'
+            ),
+            models.Index(
+                fields=('group', '-pub_date', '-id'),
+                name='post_group_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:POST_STR_LENGTH]
@@ -65,6 +84,12 @@ class Comment(models.Model):
         default_related_name = 'comments'
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('post', '-created', '-id'),
+                name='comment_post_created_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.author} - {self.text[:POST_STR_LENGTH]}'
@@ -99,3 +124,56 @@ class Follow(models.Model):
                 name='user_is_not_following'
             )
         ]
+
+
+class UserStats(models.Model):
+    """User counters model class."""
+
+    user = models.OneToOneField(
+        User,
+        verbose_name='Пользователь',
+        primary_key=True,
+        related_name='stats',
+        on_delete=models.CASCADE
+    )
+    posts_count = models.PositiveIntegerField(
+        'Количество постов', default=0)
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0)
+    followers_count = models.PositiveIntegerField(
+        'Количество подписчиков', default=0)
+    following_count = models.PositiveIntegerField(
+        'Количество подписок', default=0)
+
+    class Meta:
+        verbose_name = 'Счетчики пользователя'
+        verbose_name_plural = 'Счетчики пользователей'
+
+    def __str__(self):
+        return str(self.user)
+
+
+class FeedItem(models.Model):
+    """Materialized follow-feed entry (fan-out on write)."""
+
+    user = models.ForeignKey(
+        User,
+        verbose_name='Пользователь',
+        on_delete=models.CASCADE
+    )
+    post = models.ForeignKey(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.CASCADE
+    )
+
+    class Meta:
+        default_related_name = 'feed_items'
+        verbose_name = 'Запись ленты'
+        verbose_name_plural = 'Записи ленты'
+        constraints = [
+            models.UniqueConstraint(
+                name='unique_feed_user_post',
+                fields=('user', 'post'),
+            ),
+        ]
@@ -0,0 +1,132 @@
+"""
+Posts app's full-text search functions.
+
+PostgreSQL matches a to_tsvector expression of the post text, which is
+covered by the GIN index of migration 0006 (SEARCH_CONFIG must be the same
+as at migration time, or the index is not used). SQLite matches the FTS5
+shadow table SEARCH_TABLE, which rowids are post ids and which rows are kept
+in sync by Post signals. Other backends fall back to icontains.
+"""
+import re
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVectorField
+)
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.query import QuerySet
+from .models import Post
+
+SEARCH_TABLE: str = 'posts_post_fts'
+SEARCH_INDEX: str = 'post_text_search_idx'
+# Found posts ordering: most relevant, then latest first
+SEARCH_ORDERING: tuple = ('-rank', '-pub_date', '-id')
+
+
+class TextVector(Func):
+    """to_tsvector expression with the config inlined as the index one."""
+
+    function = 'to_tsvector'
+    template = "%(function)s('%(config)s'::regconfig, %(expressions)s)"
+    output_field = SearchVectorField()
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, config=settings.SEARCH_CONFIG, **extra)
+
+
+class MatchedIds(RawSQL):
+    """
+    FTS5 rowids matching the query. Unlike RawSQL it isn't parenthesized,
+    because the IN lookup wraps it, and `IN ((SELECT ...))` compares
+    with the first row only.
+    """
+
+    def __init__(self, fts_query: str):
+        super().__init__(
+            f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s',
+            (fts_query,)
+        )
+
+    def as_sql(self, compiler, connection):
+        return self.sql, self.params
+
+
+def get_words(query: str) -> list:
+    """Function returns words of the search query."""
+    return re.findall(r'\w+', query)
+
+
+def get_fts_query(words: list) -> str:
+    """Function returns FTS5 query, which matches rows with all the words."""
+    return ' '.join(f'"{word}"' for word in words)
+
+
+def search_posts(queryset: QuerySet, query: str) -> QuerySet:
+    """Function returns posts matching the query, most relevant first."""
+    words = get_words(query)
+    if not words:
+        return queryset.none()
+
+    if connection.vendor == 'postgresql':
+        search_query = SearchQuery(
+            ' '.join(words), config=settings.SEARCH_CONFIG
+        )
+        queryset = queryset.annotate(
+            search_vector=TextVector('text')
+        ).filter(search_vector=search_query).annotate(
+            rank=SearchRank(F('search_vector'), search_query)
+        )
+    elif connection.vendor == 'sqlite':
+        fts_query = get_fts_query(words)
+        queryset = queryset.filter(
+            id__in=MatchedIds(fts_query)
+        ).annotate(rank=RawSQL(
+            f'SELECT -bm25({SEARCH_TABLE}) FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s '
+            f'AND rowid = {Post._meta.db_table}.id',
+            (fts_query,),
+            output_field=FloatField()
+        ))
+    else:
+        condition = Q()
+        for word in words:
+            condition &= Q(text__icontains=word)
+        queryset = queryset.filter(condition).annotate(
+            rank=Value(0, output_field=FloatField())
+        )
+    return queryset.order_by(*SEARCH_ORDERING)
+
+
+def index_posts(posts) -> None:
+    """Function adds posts to the search table or updates their text."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, text) '
+            f'VALUES (%s, %s)',
+            [(post.id, post.text) for post in posts]
+        )
+
+
+def unindex_post(post_id: int) -> None:
+    """Function removes the post from the search table."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [post_id]
+        )
+
+
+def rebuild_index() -> None:
+    """Function refills the search table from the Post table."""
+    if connection.vendor != 'sqlite':
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, text) '
+            f'SELECT id, text FROM {Post._meta.db_table}'
+        )
@@ -0,0 +1,157 @@
+"""
+Posts app's signal receivers, which keep denormalized data in sync.
+"""
+from collections import Counter
+from django.conf import settings
+from django.db.models import DEFERRED
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from core.cache import PAGES_NAMESPACE, bump_version
+from .models import Comment, Follow, Group, Post, UserStats
+from . import counters, feed, graph, search, thumbnails
+
+
+def content_changed(sender, **kwargs):
+    bump_version(PAGES_NAMESPACE)
+
+
+for model in (Post, Comment, Group, Follow):
+    post_save.connect(content_changed, sender=model)
+    post_delete.connect(content_changed, sender=model)
+
+
+def posts_created(posts) -> None:
+    """Function updates denormalized data for just created posts."""
+    feed.fan_out(posts)
+    search.index_posts(posts)
+    for author_id, count in Counter(p.author_id for p in posts).items():
+        counters.change_user(author_id, posts_count=count)
+    for group_id, count in Counter(p.group_id for p in posts).items():
+        counters.change(Group, group_id, posts_count=count)
+
+
+def comments_created(comments) -> None:
+    """Function updates denormalized data for just created comments."""
+    for post_id, count in Counter(c.post_id for c in comments).items():
+        counters.change(Post, post_id, comments_count=count)
+    for author_id, count in Counter(c.author_id for c in comments).items():
+        counters.change_user(author_id, comments_count=count)
+
+
+def follows_created(user_id: int, following_ids: list) -> None:
+    """Function updates denormalized data for just created follows."""
+    if not following_ids:
+        return
+    graph.invalidate(user_id, following_ids)
+    counters.change_all(UserStats, following_ids, followers_count=1)
+    counters.change_user(user_id, following_count=len(following_ids))
+    feed.backfill_authors(user_id, following_ids)
+
+
+def follows_deleted(user_id: int, following_ids: list) -> None:
+    """Function updates denormalized data for just deleted follows."""
+    if not following_ids:
+        return
+    graph.invalidate(user_id, following_ids)
+    feed.remove_authors(user_id, following_ids)
+    counters.change_all(UserStats, following_ids, followers_count=-1)
+    counters.change_user(user_id, following_count=-len(following_ids))
+    feed.backfill_unpopular(following_ids)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_saved(sender, instance, created: bool, raw: bool, **kwargs):
+    if created and not raw:
+        UserStats.objects.create(user_id=instance.pk)
+        graph.invalidate_user(instance.pk)
+
+
+@receiver(post_init, sender=Post)
+def post_initialized(sender, instance: Post, **kwargs):
+    # group_id may be deferred, then it's read before it can change
+    instance._counted_group_id = instance.__dict__.get('group_id', DEFERRED)
+
+
+def load_counted_group_id(instance: Post) -> None:
+    """Function reads the saved group_id of the post, if it was deferred."""
+    if instance._counted_group_id is DEFERRED:
+        instance._counted_group_id = (
+            Post.objects.filter(pk=instance.pk)
+            .values_list('group_id', flat=True).first()
+        )
+
+
+@receiver(pre_save, sender=Post)
+def post_saving(sender, instance: Post, raw: bool, **kwargs):
+    # a save of the deferred group_id keeps it, unless it was assigned
+    if (not raw and not instance._state.adding
+            and 'group_id' in instance.__dict__):
+        load_counted_group_id(instance)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance: Post, created: bool, raw: bool, **kwargs):
+    if raw:
+        return
+    if created:
+        posts_created([instance])
+    else:
+        if (instance._counted_group_id is not DEFERRED
+                and instance.group_id != instance._counted_group_id):
+            counters.change(Group, instance._counted_group_id, posts_count=-1)
+            counters.change(Group, instance.group_id, posts_count=1)
+        search.index_posts([instance])
+    instance._counted_group_id = instance.__dict__.get('group_id', DEFERRED)
+    thumbnails.schedule_thumbnails(instance)
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance: Post, **kwargs):
+    # counted fields can't be loaded after the row is deleted
+    deferred = instance.get_deferred_fields() & {'author_id', 'group_id'}
+    if deferred:
+        instance.refresh_from_db(fields=deferred)
+    if instance._counted_group_id is DEFERRED:
+        instance._counted_group_id = instance.group_id
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance: Post, **kwargs):
+    search.unindex_post(instance.pk)
+    counters.change_user(instance.author_id, posts_count=-1)
+    counters.change(Group, instance._counted_group_id, posts_count=-1)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance: Comment, created: bool, raw: bool,
+                  **kwargs):
+    if created and not raw:
+        comments_created([instance])
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance: Comment, **kwargs):
+    counters.change(Post, instance.post_id, comments_count=-1)
+    counters.change_user(instance.author_id, comments_count=-1)
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance: Follow, created: bool, raw: bool,
+                 **kwargs):
+    if created and not raw:
+        graph.invalidate(instance.user_id, [instance.following_id])
+        counters.change_user(instance.following_id, followers_count=1)
+        counters.change_user(instance.user_id, following_count=1)
+        # backfill reads the followers count including the new follower
+        feed.backfill(instance.user_id, instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance: Follow, **kwargs):
+    graph.invalidate(instance.user_id, [instance.following_id])
+    feed.remove(instance.user_id, instance.following_id)
+    counters.change_user(instance.following_id, followers_count=-1)
+    counters.change_user(instance.user_id, following_count=-1)
+    feed.backfill_unpopular([instance.following_id])
@@ -0,0 +1,115 @@
+"""
+Posts app's synthetic data generator for benchmarks.
+
+Authorship, followers and comments follow a power law: a few authors
+write most of the posts and have most of the followers, a few posts get
+most of the comments. Rows are loaded through the bulk importer, which
+rebuilds counters, follow-feeds and the search index afterwards.
+"""
+import random
+from datetime import timedelta
+from typing import Iterator
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+from .importer import Importer, import_rows
+from .models import Post
+
+SYNTHETIC_LOCALE: str = 'ru_RU'
+# Exponent of the rank-frequency (Zipf) distributions
+SYNTHETIC_ALPHA: float = 1.2
+SYNTHETIC_DAYS: int = 365
+
+
+def zipf_weights(count: int, alpha: float = SYNTHETIC_ALPHA) -> list:
+    """Function returns weights of ranks 1..count, which follow Zipf's law."""
+    return [1 / rank ** alpha for rank in range(1, count + 1)]
+
+
+class Generator:
+    """Generates rows of the export_data format with power-law relations."""
+
+    def __init__(self, users: int, groups: int, posts: int, comments: int,
+                 follows: int, alpha: float = SYNTHETIC_ALPHA, seed: int = 0):
+        self.random = random.Random(seed)
+        self.fake = Faker(SYNTHETIC_LOCALE)
+        self.fake.seed_instance(seed)
+        self.usernames = [
+            f'{self.fake.user_name()}{index}' for index in range(users)
+        ]
+        self.slugs = [f'group{index}' for index in range(groups)]
+        self.posts = posts
+        self.comments = comments
+        self.follows = follows
+        self.weights = zipf_weights(users, alpha)
+        self.post_weights = zipf_weights(posts, alpha)
+        self.first_post_id = (
+            Post.objects.aggregate(last=Max('id'))['last'] or 0
+        ) + 1
+        self.now = timezone.now()
+
+    def get_date(self) -> str:
+        seconds = self.random.randrange(SYNTHETIC_DAYS * 24 * 3600)
+        return (self.now - timedelta(seconds=seconds)).isoformat()
+
+    def choose_users(self, count: int) -> list:
+        """Method returns count users, popular ones more likely."""
+        return self.random.choices(self.usernames, self.weights, k=count)
+
+    def iter_groups(self) -> Iterator[dict]:
+        for slug in self.slugs:
+            yield {
+                'slug': slug,
+                'title': self.fake.sentence(nb_words=3),
+                'description': self.fake.text(max_nb_chars=200),
+            }
+
+    def iter_posts(self) -> Iterator[dict]:
+        authors = self.choose_users(self.posts)
+        for index, author in enumerate(authors):
+            yield {
+                'id': self.first_post_id + index,
+                'author': author,
+                'group': (self.random.choice(self.slugs)
+                          if self.slugs and self.random.random() < 0.5
+                          else None),
+                'text': self.fake.text(max_nb_chars=400),
+                'pub_date': self.get_date(),
+            }
+
+    def iter_comments(self) -> Iterator[dict]:
+        if not self.posts:
+            return
+        posts_ids = self.random.choices(
+            range(self.first_post_id, self.first_post_id + self.posts),
+            self.post_weights, k=self.comments
+        )
+        for post_id in posts_ids:
+            yield {
+                'post': post_id,
+                'author': self.random.choice(self.usernames),
+                'text': self.fake.sentence(nb_words=10),
+                'created': self.get_date(),
+            }
+
+    def iter_follows(self) -> Iterator[dict]:
+        """
+        Method yields follows of all the users: the numbers of followed
+        authors and their followers are both heavy-tailed.
+        """
+        for user in self.usernames:
+            count = min(
+                int(self.random.paretovariate(2) * self.follows / 2),
+                len(self.usernames) - 1
+            )
+            for following in self.choose_users(count):
+                yield {'user': user, 'following': following}
+
+    def generate(self) -> Importer:
+        """Method loads the generated rows to the database."""
+        return import_rows({
+            'groups': self.iter_groups(),
+            'posts': self.iter_posts(),
+            'comments': self.iter_comments(),
+            'follows': self.iter_follows(),
+        })
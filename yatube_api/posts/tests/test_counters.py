@@ -0,0 +1,134 @@
+from django.db import connection
+from django.test import TestCase
+from ..bulk import bulk_follow, bulk_unfollow
+from ..counters import recount
+from ..models import Comment, Follow, Group, Post, User, UserStats
+
+
+class PostsCountersTest(TestCase):
+    """Posts app denormalized counters test-class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Makes class-fixtures for tests of counters."""
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='test group', description='description', slug='test_group'
+        )
+        cls.second_group = Group.objects.create(
+            title='second group', description='description', slug='second'
+        )
+
+    def assertCounters(self, obj, **counters):
+        obj.refresh_from_db()
+        for field, value in counters.items():
+            with self.subTest(obj=obj, field=field):
+                self.assertEqual(
+                    getattr(obj, field),
+                    value,
+                    f'Неверное значение счетчика {field} у {obj}'
+                )
+
+    def test_post_counters(self):
+        """Test-function: posts counters follow create, edit and delete."""
+        author = PostsCountersTest.author
+        group = PostsCountersTest.group
+        second_group = PostsCountersTest.second_group
+        post = Post.objects.create(text='пост', author=author, group=group)
+        self.assertCounters(author.stats, posts_count=1)
+        self.assertCounters(group, posts_count=1)
+
+        post = Post.objects.get(pk=post.pk)
+        post.group = second_group
+        post.save()
+        self.assertCounters(group, posts_count=0)
+        self.assertCounters(second_group, posts_count=1)
+
+        post.delete()
+        self.assertCounters(author.stats, posts_count=0)
+        self.assertCounters(second_group, posts_count=0)
+
+    def test_deferred_group_counters(self):
+        """Test-function: posts with deferred group keep group counters."""
+        group = PostsCountersTest.group
+        second_group = PostsCountersTest.second_group
+        post = Post.objects.create(
+            text='пост', author=PostsCountersTest.author, group=group
+        )
+        post = Post.objects.only('text').get(pk=post.pk)
+        post.text = 'новый текст'
+        post.save()
+        self.assertCounters(group, posts_count=1)
+
+        post = Post.objects.only('text').get(pk=post.pk)
+        post.group = second_group
+        post.save()
+        self.assertCounters(group, posts_count=0)
+        self.assertCounters(second_group, posts_count=1)
+
+        Post.objects.only('text').get(pk=post.pk).delete()
+        self.assertCounters(second_group, posts_count=0)
+
+    def test_comment_counters(self):
+        """Test-function: comments counters follow create and delete."""
+        reader = PostsCountersTest.reader
+        post = Post.objects.create(
+            text='пост', author=PostsCountersTest.author
+        )
+        comment = Comment.objects.create(
+            text='комментарий', author=reader, post=post
+        )
+        self.assertCounters(post, comments_count=1)
+        self.assertCounters(reader.stats, comments_count=1)
+
+        comment.delete()
+        self.assertCounters(post, comments_count=0)
+        self.assertCounters(reader.stats, comments_count=0)
+
+    def test_follow_counters(self):
+        """Test-function: follow counters follow create and delete."""
+        author = PostsCountersTest.author
+        reader = PostsCountersTest.reader
+        Follow.objects.create(user=reader, following=author)
+        self.assertCounters(author.stats, followers_count=1)
+        self.assertCounters(reader.stats, following_count=1)
+
+        author.following.filter(user=reader).delete()
+        self.assertCounters(author.stats, followers_count=0)
+        self.assertCounters(reader.stats, following_count=0)
+
+    def test_bulk_follow_counters(self):
+        """Test-function: bulk follows count only the changed rows."""
+        author = PostsCountersTest.author
+        reader = PostsCountersTest.reader
+        # follows changed by a concurrent request, without signals
+        with connection.cursor() as cursor:
+            Follow.objects.bulk_create([Follow(user=reader, following=author)])
+            self.assertEqual(bulk_follow(reader.id, [author.id]), [])
+            self.assertCounters(author.stats, followers_count=0)
+
+            cursor.execute(f'DELETE FROM {Follow._meta.db_table}')
+            self.assertEqual(bulk_follow(reader.id, [author.id]), [author.id])
+            self.assertCounters(author.stats, followers_count=1)
+            cursor.execute(f'DELETE FROM {Follow._meta.db_table}')
+            self.assertEqual(bulk_unfollow(reader.id, [author.id]), [])
+            self.assertCounters(author.stats, followers_count=1)
+            self.assertCounters(reader.stats, following_count=1)
+
+    def test_recount(self):
+        """Test-function: recount fixes drifted counters."""
+        author = PostsCountersTest.author
+        post = Post.objects.create(
+            text='пост', author=author, group=PostsCountersTest.group
+        )
+        Comment.objects.create(text='комментарий', author=author, post=post)
+        UserStats.objects.filter(user=author).delete()
+        Post.objects.update(comments_count=10)
+        Group.objects.update(posts_count=10)
+
+        recount()
+        self.assertCounters(author.stats, posts_count=1, comments_count=1)
+        self.assertCounters(post, comments_count=1)
+        self.assertCounters(PostsCountersTest.group, posts_count=1)
@@ -0,0 +1,88 @@
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from ..export import get_export_queryset, iter_export
+from ..models import Comment, Group, Post, User
+
+
+class PostsExportTest(TestCase):
+    """Posts app streaming export test-class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Makes class-fixtures for tests of export."""
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='test group', description='description', slug='test_group'
+        )
+        cls.old_post = Post.objects.create(
+            text='старый пост', author=cls.author, group=cls.group
+        )
+        Post.objects.filter(pk=cls.old_post.pk).update(
+            pub_date=timezone.now() - timedelta(days=10)
+        )
+        cls.new_post = Post.objects.create(
+            text='новый пост', author=cls.author
+        )
+        cls.comment = Comment.objects.create(
+            text='комментарий', author=cls.author, post=cls.new_post
+        )
+
+    def test_ndjson_export(self):
+        """Test-function: posts are exported as NDJSON lines."""
+        out = StringIO()
+        call_command('export_data', 'posts', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [
+            PostsExportTest.old_post.id, PostsExportTest.new_post.id
+        ])
+        self.assertEqual(rows[0]['author'], 'author')
+        self.assertEqual(rows[0]['group'], 'test_group')
+        self.assertIsNone(rows[1]['group'])
+
+    def test_csv_export(self):
+        """Test-function: comments are exported as CSV with header."""
+        out = StringIO()
+        call_command('export_data', 'comments', output='csv', stdout=out)
+        rows = list(csv.reader(StringIO(out.getvalue())))
+        self.assertEqual(rows[0], ['id', 'post', 'author', 'text', 'created'])
+        self.assertEqual(rows[1][:4], [
+            str(PostsExportTest.comment.id),
+            str(PostsExportTest.new_post.id),
+            'author',
+            'комментарий'
+        ])
+
+    def test_since_until(self):
+        """Test-function: since and until filter by publication date."""
+        yesterday = (timezone.now() - timedelta(days=1)).date().isoformat()
+        self.assertEqual(
+            list(get_export_queryset('posts', since=yesterday)
+                 .values_list('id', flat=True)),
+            [PostsExportTest.new_post.id]
+        )
+        self.assertEqual(
+            list(get_export_queryset('posts', until=yesterday)
+                 .values_list('id', flat=True)),
+            [PostsExportTest.old_post.id]
+        )
+        with self.assertRaises(ValueError):
+            get_export_queryset('posts', since='вчера')
+
+    def test_keyset_batches(self):
+        """Test-function: without server-side cursors rows go in batches."""
+        queryset = get_export_queryset('posts')
+        with mock.patch.dict(
+            connection.settings_dict, DISABLE_SERVER_SIDE_CURSORS=True
+        ):
+            # a batch per post and the last empty one
+            with self.assertNumQueries(3):
+                lines = list(iter_export('posts', 'ndjson', queryset, 1))
+        self.assertEqual(len(lines), 2)
@@ -0,0 +1,169 @@
+from django.test import TestCase, override_settings
+from ..bulk import bulk_follow, bulk_unfollow
+from ..feed import backfill_authors, get_feed, rebuild_feed
+from ..models import FeedItem, Follow, Post, User
+
+
+class PostsFeedTest(TestCase):
+    """Posts app follow-feed test-class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Makes class-fixtures for tests of follow-feed."""
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.stranger = User.objects.create_user(username='stranger')
+        cls.old_post = Post.objects.create(
+            text='старый пост', author=cls.author
+        )
+        Post.objects.create(text='чужой пост', author=cls.stranger)
+
+    def test_follow_backfills_feed(self):
+        """Test-function: new follow adds author's posts to the feed."""
+        Follow.objects.create(
+            user=PostsFeedTest.reader, following=PostsFeedTest.author
+        )
+        self.assertEqual(
+            list(get_feed(PostsFeedTest.reader)),
+            [PostsFeedTest.old_post],
+            'После подписки в ленте должны быть посты автора'
+        )
+
+    def test_new_post_fan_out(self):
+        """Test-function: new post is added to the followers' feeds."""
+        Follow.objects.create(
+            user=PostsFeedTest.reader, following=PostsFeedTest.author
+        )
+        new_post = Post.objects.create(
+            text='новый пост', author=PostsFeedTest.author
+        )
+        self.assertTrue(
+            FeedItem.objects.filter(
+                user=PostsFeedTest.reader, post=new_post
+            ).exists(),
+            'Новый пост должен попадать в ленту подписчика'
+        )
+        self.assertEqual(
+            get_feed(PostsFeedTest.reader).first(),
+            new_post,
+            'Лента должна быть отсортирована по дате публикации'
+        )
+
+    def test_bulk_follow(self):
+        """Test-function: bulk follow and unfollow update the feed."""
+        reader = PostsFeedTest.reader
+        authors_ids = [PostsFeedTest.author.id, PostsFeedTest.stranger.id]
+        self.assertEqual(bulk_follow(reader.id, authors_ids), authors_ids)
+        self.assertEqual(bulk_follow(reader.id, authors_ids), [])
+        self.assertEqual(
+            get_feed(reader).count(), 2,
+            'После подписки в ленте должны быть посты всех авторов'
+        )
+        self.assertEqual(
+            bulk_unfollow(reader.id, authors_ids[:1]), authors_ids[:1]
+        )
+        self.assertEqual(
+            list(get_feed(reader).values_list('author_id', flat=True)),
+            authors_ids[1:],
+            'После отписки в ленте не должно быть постов автора'
+        )
+
+    @override_settings(FEED_BACKFILL_SIZE=1)
+    def test_backfill_authors(self):
+        """Test-function: latest posts of the authors are added at once."""
+        new_post = Post.objects.create(
+            text='новый пост', author=PostsFeedTest.author
+        )
+        stranger_post = Post.objects.get(author=PostsFeedTest.stranger)
+        Follow.objects.bulk_create([
+            Follow(user=PostsFeedTest.reader, following=author)
+            for author in (PostsFeedTest.author, PostsFeedTest.stranger)
+        ])
+        with self.assertNumQueries(1):
+            backfill_authors(
+                PostsFeedTest.reader.id,
+                [PostsFeedTest.author.id, PostsFeedTest.stranger.id]
+            )
+        self.assertEqual(
+            set(FeedItem.objects.values_list('post_id', flat=True)),
+            {new_post.id, stranger_post.id},
+            'В ленту должны попасть последние посты каждого автора'
+        )
+
+    def test_unfollow_clears_feed(self):
+        """Test-function: unfollow removes author's posts from the feed."""
+        Follow.objects.create(
+            user=PostsFeedTest.reader, following=PostsFeedTest.author
+        )
+        PostsFeedTest.author.following.filter(
+            user=PostsFeedTest.reader
+        ).delete()
+        self.assertFalse(
+            get_feed(PostsFeedTest.reader).exists(),
+            'После отписки лента должна быть пустой'
+        )
+
+    @override_settings(FEED_FANOUT_MAX_FOLLOWERS=0)
+    def test_fan_out_on_read_fallback(self):
+        """Test-function: popular authors' posts are read on the fly."""
+        Follow.objects.create(
+            user=PostsFeedTest.reader, following=PostsFeedTest.author
+        )
+        new_post = Post.objects.create(
+            text='новый пост', author=PostsFeedTest.author
+        )
+        self.assertFalse(
+            FeedItem.objects.exists(),
+            'Посты популярных авторов не должны материализоваться'
+        )
+        self.assertEqual(
+            list(get_feed(PostsFeedTest.reader)),
+            [new_post, PostsFeedTest.old_post],
+            'Посты популярных авторов должны попадать в ленту при чтении'
+        )
+
+    def test_rebuild_feed(self):
+        """Test-function: rebuild restores materialized feeds."""
+        Follow.objects.create(
+            user=PostsFeedTest.reader, following=PostsFeedTest.author
+        )
+        FeedItem.objects.all().delete()
+        rebuild_feed()
+        self.assertEqual(
+            list(get_feed(PostsFeedTest.reader)),
+            [PostsFeedTest.old_post],
+            'Перестроение ленты должно восстановить записи'
+        )
+
+    @override_settings(FEED_BACKFILL_SIZE=1)
+    def test_rebuild_feed_backfill_size(self):
+        """Test-function: rebuild keeps the latest posts like a follow."""
+        new_post = Post.objects.create(
+            text='новый пост', author=PostsFeedTest.author
+        )
+        Follow.objects.create(
+            user=PostsFeedTest.reader, following=PostsFeedTest.author
+        )
+        rebuild_feed()
+        self.assertEqual(
+            list(FeedItem.objects.values_list('post_id', flat=True)),
+            [new_post.id],
+            'Перестроение должно добавлять столько же постов, что и подписка'
+        )
+
+    @override_settings(FEED_FANOUT_MAX_FOLLOWERS=1)
+    def test_author_drops_to_fanout_limit(self):
+        """Test-function: posts of a formerly popular author are kept."""
+        author = PostsFeedTest.author
+        Follow.objects.create(user=PostsFeedTest.reader, following=author)
+        Follow.objects.create(user=PostsFeedTest.stranger, following=author)
+        new_post = Post.objects.create(text='новый пост', author=author)
+        self.assertFalse(FeedItem.objects.filter(post=new_post).exists())
+
+        author.following.filter(user=PostsFeedTest.stranger).delete()
+        self.assertEqual(
+            list(get_feed(PostsFeedTest.reader)),
+            [new_post, PostsFeedTest.old_post],
+            'Посты автора, ставшего непопулярным, должны остаться в ленте'
+        )
@@ -0,0 +1,87 @@
+from unittest import mock
+from django.core.cache import cache, caches
+from django.test import TestCase
+from django.urls import reverse
+from ..models import Follow, Group, Post, User
+
+
+class PostFragmentsTest(TestCase):
+    """Posts app cached post cards test-class."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='test group', description='description', slug='test_group'
+        )
+        cls.post = Post.objects.create(
+            text='старый текст', author=cls.author, group=cls.group
+        )
+        Follow.objects.create(user=cls.reader, following=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(PostFragmentsTest.reader)
+
+    def get_rendered_fragments(self, url: str) -> list:
+        """Method returns names of the fragments rendered by the request."""
+        fragments_cache = caches['default']
+        with mock.patch.object(
+            fragments_cache, 'set', wraps=fragments_cache.set
+        ) as cache_set:
+            self.client.get(url)
+        return [
+            call[0][0].split('.')[2] for call in cache_set.call_args_list
+            if call[0][0].startswith('template.cache.')
+        ]
+
+    def test_card_cached(self):
+        """Test-function: post card is rendered once and then cached."""
+        url = reverse('posts:index')
+        self.assertEqual(
+            self.get_rendered_fragments(url), ['post_body', 'post_card']
+        )
+        self.assertEqual(self.get_rendered_fragments(url), [])
+
+    def test_card_shared(self):
+        """Test-function: lists and post page render the cached card."""
+        post = PostFragmentsTest.post
+        self.client.get(reverse('posts:index'))
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(post.group.slug,)),
+            reverse('posts:profile', args=(post.author.username,)),
+            reverse('posts:follow_index'),
+            reverse('posts:post_detail', args=(post.id,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.get_rendered_fragments(url), [])
+
+    def test_card_invalidated(self):
+        """Test-function: edited post gets a new card."""
+        post = Post.objects.get(pk=PostFragmentsTest.post.pk)
+        self.client.get(reverse('posts:index'))
+        post.text = 'новый текст'
+        post.save()
+        for url in (reverse('posts:index'),
+                    reverse('posts:post_detail', args=(post.id,))):
+            with self.subTest(url=url):
+                content = self.client.get(url).content.decode()
+                self.assertIn('<p>новый текст</p>', content)
+                self.assertNotIn('<p>старый текст</p>', content)
+
+    def test_card_not_stale(self):
+        """Test-function: changes without Post.save() get a new card."""
+        post = PostFragmentsTest.post
+        url = reverse('posts:index')
+        self.client.get(url)
+        Post.objects.filter(pk=post.pk).update(text='новый текст')
+        User.objects.filter(pk=post.author.pk).update(first_name='Иван')
+        Group.objects.filter(pk=post.group.pk).delete()
+        content = self.client.get(url).content.decode()
+        self.assertIn('<p>новый текст</p>', content)
+        self.assertIn('Иван', content)
+        self.assertNotIn(reverse('posts:group_list', args=('test_group',)),
+                         content)
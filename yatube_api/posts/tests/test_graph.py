@@ -0,0 +1,121 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from core.cache import get_version
+from ..bulk import bulk_follow, bulk_unfollow
+from ..models import Follow, User
+from .. import graph
+
+
+class FollowGraphTest(TestCase):
+    """Posts app follow-graph test-class."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.friend = User.objects.create_user(username='friend')
+        cls.stranger = User.objects.create_user(username='stranger')
+
+    def setUp(self):
+        for user in (self.reader, self.author, self.friend, self.stranger):
+            graph.invalidate_user(user.id)
+
+    def test_sets_cached(self):
+        """Test-function: sets are read by one query and then cached."""
+        Follow.objects.create(user=self.reader, following=self.author)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                graph.get_following_ids(self.reader.id), {self.author.id}
+            )
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                graph.get_following_ids(self.reader.id), {self.author.id}
+            )
+        with self.assertNumQueries(1):
+            sets = graph.get_sets(
+                graph.FOLLOWERS, [self.author.id, self.stranger.id]
+            )
+        self.assertEqual(sets, {
+            self.author.id: {self.reader.id}, self.stranger.id: set()
+        })
+        self.assertEqual(
+            graph.is_following(
+                self.reader.id, [self.author.id, self.stranger.id]
+            ),
+            {self.author.id: True, self.stranger.id: False}
+        )
+
+    def test_suggestions(self):
+        """Test-function: friends-of-friends are suggested."""
+        Follow.objects.bulk_create([
+            Follow(user=self.reader, following=self.friend),
+            Follow(user=self.reader, following=self.author),
+            Follow(user=self.friend, following=self.stranger),
+            Follow(user=self.friend, following=self.author),
+            Follow(user=self.friend, following=self.reader),
+            Follow(user=self.author, following=self.stranger),
+        ])
+        self.assertEqual(
+            graph.get_suggestions(self.reader.id), [(self.stranger.id, 2)]
+        )
+
+    def test_profile_following(self):
+        """Test-function: profile reads the follow status from the cache."""
+        Follow.objects.create(user=self.reader, following=self.author)
+        self.client.force_login(self.reader)
+        url = reverse('posts:profile', args=(self.author.username,))
+        response = self.client.get(url)
+        self.assertTrue(response.context['following'])
+        # session, user, author and posts page, no follow query
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+
+class FollowGraphInvalidationTest(TransactionTestCase):
+    """Posts app follow-graph invalidation on commit test-class."""
+
+    def setUp(self):
+        self.reader = User.objects.create_user(username='reader')
+        self.author = User.objects.create_user(username='author')
+        self.friend = User.objects.create_user(username='friend')
+
+    def test_invalidation(self):
+        """Test-function: follow changes drop the cached sets."""
+        self.assertEqual(graph.get_following_ids(self.reader.id), set())
+        self.assertEqual(graph.get_followers_ids(self.author.id), set())
+        follow = Follow.objects.create(
+            user=self.reader, following=self.author
+        )
+        self.assertEqual(
+            graph.get_following_ids(self.reader.id), {self.author.id}
+        )
+        self.assertEqual(
+            graph.get_followers_ids(self.author.id), {self.reader.id}
+        )
+        follow.delete()
+        self.assertEqual(graph.get_following_ids(self.reader.id), set())
+
+        bulk_follow(self.reader.id, [self.author.id, self.friend.id])
+        self.assertEqual(
+            graph.get_following_ids(self.reader.id),
+            {self.author.id, self.friend.id}
+        )
+        bulk_unfollow(self.reader.id, [self.friend.id])
+        self.assertEqual(graph.get_followers_ids(self.friend.id), set())
+
+    def test_invalidated_on_commit(self):
+        """Test-function: sets are dropped only after the commit."""
+        self.assertEqual(graph.get_following_ids(self.reader.id), set())
+        key = graph.get_key(
+            graph.FOLLOWING, self.reader.id,
+            get_version(graph.GRAPH_NAMESPACE)
+        )
+        with transaction.atomic():
+            Follow.objects.create(user=self.reader, following=self.author)
+            self.assertEqual(cache.get(key), set())
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(
+            graph.get_following_ids(self.reader.id), {self.author.id}
+        )
@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from ..importer import import_files, import_rows
+from ..models import Comment, FeedItem, Follow, Group, Post, User
+from ..search import search_posts
+
+
+class PostsImportTest(TestCase):
+    """Posts app bulk import test-class."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.dir, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return path
+
+    def write_ndjson(self, name: str, rows: list) -> str:
+        return self.write(name, ''.join(
+            json.dumps(row, ensure_ascii=False) + '\n' for row in rows
+        ))
+
+    def test_import_files(self):
+        """Test-function: rows are imported and denormalized data rebuilt."""
+        User.objects.create_user(username='reader')
+        paths = {
+            'groups': self.write_ndjson('groups.ndjson', [
+                {'slug': 'cats', 'title': 'Коты', 'description': 'о котах'},
+            ]),
+            'posts': self.write_ndjson('posts.ndjson', [
+                {'id': 50, 'author': 'writer', 'group': 'cats',
+                 'text': 'пушистый кот', 'pub_date': '2021-05-01T10:00:00'},
+                {'id': 51, 'author': 'writer', 'group': 'dogs',
+                 'text': 'группы нет', 'pub_date': '2021-05-01'},
+            ]),
+            'comments': self.write(
+                'comments.csv',
+                'id,post,author,text,created\n'
+                '1,50,reader,отличный кот,2021-05-02\n'
+                '2,99,reader,поста нет,2021-05-02\n'
+            ),
+            'follows': self.write_ndjson('follows.ndjson', [
+                {'user': 'reader', 'following': 'writer'},
+                {'user': 'reader', 'following': 'writer'},
+                {'user': 'reader', 'following': 'reader'},
+            ]),
+        }
+        importer = import_files(paths)
+        self.assertEqual(importer.imported, {
+            'groups': 1, 'posts': 1, 'comments': 1, 'follows': 1
+        })
+        self.assertEqual(importer.skipped, {
+            'posts': 1, 'comments': 1, 'follows': 2
+        })
+
+        post = Post.objects.get(id=50)
+        self.assertEqual(post.author.username, 'writer')
+        self.assertEqual(post.group.slug, 'cats')
+        self.assertEqual(post.pub_date.date().isoformat(), '2021-05-01')
+        self.assertEqual(post.comments_count, 1)
+        self.assertEqual(Group.objects.get(slug='cats').posts_count, 1)
+        self.assertEqual(
+            Comment.objects.get().created.date().isoformat(), '2021-05-02'
+        )
+        self.assertEqual(post.author.stats.followers_count, 1)
+        self.assertTrue(
+            FeedItem.objects.filter(user__username='reader', post=post)
+            .exists()
+        )
+        self.assertEqual(
+            list(search_posts(Post.objects.all(), 'кот')), [post]
+        )
+        new_post = Post.objects.create(text='новый', author=post.author)
+        self.assertGreater(new_post.id, 50)
+        self.assertGreater(
+            new_post.pub_date, timezone.now() - timedelta(minutes=1)
+        )
+
+    def test_dates_not_shared(self):
+        """Test-function: posts created during an import get their dates."""
+        author = User.objects.create_user(username='author')
+        created = []
+
+        def rows():
+            yield {'author': 'author', 'text': 'старый',
+                   'pub_date': '2021-05-01'}
+            created.append(Post.objects.create(text='новый', author=author))
+
+        import_rows({'posts': rows()})
+        self.assertGreater(
+            created[0].pub_date, timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(
+            Post.objects.get(text='старый').pub_date.date().isoformat(),
+            '2021-05-01'
+        )
+
+    def test_no_create_users(self):
+        """Test-function: rows of unknown users are skipped."""
+        path = self.write_ndjson('posts.ndjson', [
+            {'author': 'stranger', 'text': 'текст'},
+        ])
+        importer = import_files({'posts': path}, create_users=False)
+        self.assertEqual(importer.skipped['posts'], 1)
+        self.assertFalse(User.objects.filter(username='stranger').exists())
+
+    def test_skipped_rows_users_stats(self):
+        """Test-function: users created by skipped rows get counters."""
+        importer = import_rows({'posts': [
+            {'author': 'stranger', 'text': 'текст', 'group': 'unknown'},
+        ]})
+        self.assertEqual(importer.skipped['posts'], 1)
+        stranger = User.objects.get(username='stranger')
+        Post.objects.create(text='новый пост', author=stranger)
+        stranger.stats.refresh_from_db()
+        self.assertEqual(stranger.stats.posts_count, 1)
+
+    def test_export_round_trip(self):
+        """Test-function: export_data output is imported back."""
+        author = User.objects.create_user(username='author')
+        post = Post.objects.create(text='первый пост', author=author)
+        Comment.objects.create(text='комментарий', author=author, post=post)
+        Follow.objects.create(
+            user=User.objects.create_user(username='reader'),
+            following=author
+        )
+        paths = {}
+        for name, output in (('posts', 'ndjson'), ('comments', 'csv')):
+            paths[name] = os.path.join(self.dir, f'{name}.{output}')
+            call_command(
+                'export_data', name, output=output, file=paths[name]
+            )
+        Post.objects.all().delete()
+
+        out = StringIO()
+        call_command(
+            'import_data', posts=paths['posts'],
+            comments=paths['comments'], batch_size=1, stdout=out
+        )
+        self.assertIn('posts: 1 imported, 0 skipped', out.getvalue())
+        post = Post.objects.get(id=post.id)
+        self.assertEqual(post.text, 'первый пост')
+        self.assertEqual(post.comments_count, 1)
+        self.assertTrue(
+            FeedItem.objects.filter(user__username='reader', post=post)
+            .exists()
+        )
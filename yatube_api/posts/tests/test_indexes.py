@@ -0,0 +1,99 @@
+import re
+from django.db import connection
+from django.test import TestCase
+from api.pagination import CommentCursorPagination, PostCursorPagination
+from ..feed import get_feed
+from ..models import Comment, FeedItem, Follow, Group, Post, User
+from ..utils import get_posts_list
+
+
+class QueryPlanTest(TestCase):
+    """Posts app query plans test-class: key querysets use indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='test group', description='description', slug='test_group'
+        )
+        cls.post = Post.objects.create(
+            text='текст', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # small test tables are cheaper to scan than to search
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index: str):
+        """Method asserts the queryset is read by the index, without sort."""
+        plan = queryset.explain()
+        self.assertIn(index, plan, f'Индекс {index} не используется:\n{plan}')
+        if connection.vendor == 'postgresql':
+            self.assertNotIn('Seq Scan', plan, plan)
+            self.assertNotRegex(plan, r'(?m)^\s*(->\s*)?Sort\b', plan)
+        elif connection.vendor == 'sqlite':
+            self.assertNotIn('TEMP B-TREE', plan, plan)
+            self.assertIsNone(
+                re.search(r'\bSCAN \w+$', plan, re.MULTILINE),
+                f'Полный просмотр таблицы:\n{plan}'
+            )
+
+    def test_posts_lists(self):
+        """Test-function: post lists are read by pub_date indexes."""
+        self.assertUsesIndex(get_posts_list()[:10], 'post_pub_date_id_idx')
+        self.assertUsesIndex(
+            get_posts_list(group=QueryPlanTest.group)[:10],
+            'post_group_pub_date_idx'
+        )
+        self.assertUsesIndex(
+            get_posts_list(author=QueryPlanTest.author)[:10],
+            'post_author_pub_date_idx'
+        )
+        pagination = PostCursorPagination()
+        position = pagination._get_position_from_instance(
+            QueryPlanTest.post, pagination.ordering
+        )
+        self.assertUsesIndex(
+            Post.objects.filter(
+                pagination.get_position_filter(position, reverse=False)
+            ).order_by(*pagination.ordering)[:10],
+            'post_pub_date_id_idx'
+        )
+
+    def test_comments_list(self):
+        """Test-function: comments of a post are read by the post index."""
+        self.assertUsesIndex(
+            QueryPlanTest.post.comments.all(), 'comment_post_created_idx'
+        )
+        self.assertUsesIndex(
+            Comment.objects.filter(post=QueryPlanTest.post)
+            .order_by(*CommentCursorPagination.ordering)[:10],
+            'comment_post_created_idx'
+        )
+
+    def test_follows(self):
+        """Test-function: follows and feed items are read by user."""
+        if connection.vendor != 'sqlite':
+            self.skipTest('Имена индексов ограничений зависят от СУБД.')
+        self.assertUsesIndex(
+            Follow.objects.filter(user=QueryPlanTest.reader),
+            'sqlite_autoindex_posts_follow_1'
+        )
+        self.assertUsesIndex(
+            FeedItem.objects.filter(user=QueryPlanTest.reader),
+            'sqlite_autoindex_posts_feeditem_1'
+        )
+        self.assertIn(
+            'sqlite_autoindex_posts_feeditem_1',
+            get_feed(QueryPlanTest.reader).explain()
+        )
+
+    def test_username_prefix(self):
+        """Test-function: username prefix search is an index range scan."""
+        self.assertUsesIndex(
+            User.objects.filter(username__istartswith='AUTH'),
+            'auth_user_username_prefix_idx'
+        )
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from ..bulk import bulk_create_posts
+from ..models import Post, User
+from ..search import rebuild_index, search_posts
+
+
+class PostsSearchTest(TestCase):
+    """Posts app full-text search test-class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Makes class-fixtures for tests of search."""
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.cats_post = Post.objects.create(
+            text='Коты любят спать на солнце', author=cls.author
+        )
+        cls.dogs_post = Post.objects.create(
+            text='Собаки любят гулять', author=cls.author
+        )
+
+    def search(self, query):
+        return list(search_posts(Post.objects.all(), query))
+
+    def test_search_matches_all_words(self):
+        """Test-function: search finds posts containing all the words."""
+        self.assertEqual(
+            self.search('любят'),
+            [PostsSearchTest.dogs_post, PostsSearchTest.cats_post]
+        )
+        self.assertEqual(
+            self.search('коты СОЛНЦЕ'), [PostsSearchTest.cats_post]
+        )
+        self.assertEqual(self.search('коты гулять'), [])
+        self.assertEqual(self.search('"*('), [])
+
+    def test_search_ranked(self):
+        """Test-function: more relevant posts go first."""
+        relevant_post = Post.objects.create(
+            text='Коты, коты и еще раз коты', author=PostsSearchTest.author
+        )
+        self.assertEqual(
+            self.search('коты'), [relevant_post, PostsSearchTest.cats_post]
+        )
+
+    def test_index_follows_changes(self):
+        """Test-function: edited, deleted and bulk created posts are synced."""
+        post = Post.objects.get(pk=PostsSearchTest.dogs_post.pk)
+        post.text = 'Собаки любят кости'
+        post.save()
+        self.assertEqual(self.search('гулять'), [])
+        self.assertEqual(self.search('кости'), [post])
+
+        post.delete()
+        self.assertEqual(self.search('кости'), [])
+
+        bulk_post, = bulk_create_posts(
+            [Post(text='Попугаи любят петь', author=PostsSearchTest.author)]
+        )
+        self.assertEqual(self.search('попугаи'), [bulk_post])
+
+    def test_rebuild_index(self):
+        """Test-function: rebuild restores posts updated without signals."""
+        Post.objects.filter(pk=PostsSearchTest.cats_post.pk).update(
+            text='Хомяки'
+        )
+        rebuild_index()
+        self.assertEqual(self.search('хомяки'), [PostsSearchTest.cats_post])
+
+    def test_admin_search_ranked(self):
+        """Test-function: admin search keeps the most relevant first."""
+        admin = User.objects.create_superuser('admin', 'admin@yatube.ru', '1')
+        relevant_post = Post.objects.create(
+            text='Коты, коты и еще раз коты', author=PostsSearchTest.author
+        )
+        Post.objects.filter(pk=relevant_post.pk).update(
+            pub_date=PostsSearchTest.cats_post.pub_date - timedelta(days=1)
+        )
+        self.client.force_login(admin)
+        response = self.client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'коты'}
+        )
+        self.assertEqual(
+            list(response.context['cl'].result_list),
+            [relevant_post, PostsSearchTest.cats_post]
+        )
+
+    def test_search_page(self):
+        """Test-function: search page shows found posts."""
+        response = self.client.get(reverse('posts:search'), {'q': 'коты'})
+        self.assertEqual(
+            list(response.context['page_obj']), [PostsSearchTest.cats_post]
+        )
+        self.assertEqual(response.context['query'], 'коты')
@@ -0,0 +1,36 @@
+from collections import Counter
+from django.test import TestCase
+from ..models import Comment, FeedItem, Follow, Group, Post, User
+from ..synthetic import Generator, zipf_weights
+
+
+class SyntheticDataTest(TestCase):
+    """Posts app synthetic data generator test-class."""
+
+    def test_zipf_weights(self):
+        """Test-function: weights decrease by rank."""
+        weights = zipf_weights(3, alpha=1)
+        self.assertEqual(weights, [1, 1 / 2, 1 / 3])
+
+    def test_generate(self):
+        """Test-function: rows are generated with power-law authorship."""
+        importer = Generator(
+            users=50, groups=3, posts=300, comments=200, follows=5, seed=1
+        ).generate()
+        self.assertEqual(importer.imported['posts'], 300)
+        self.assertEqual(Post.objects.count(), 300)
+        self.assertEqual(Group.objects.count(), 3)
+        self.assertEqual(Comment.objects.count(), 200)
+        self.assertTrue(Follow.objects.exists())
+        self.assertTrue(FeedItem.objects.exists())
+        self.assertLessEqual(User.objects.count(), 50)
+
+        posts_by_author = Counter(
+            Post.objects.values_list('author_id', flat=True)
+        ).most_common()
+        self.assertGreater(posts_by_author[0][1], 300 / 50 * 3)
+        popular_post = Post.objects.order_by('-comments_count').first()
+        self.assertEqual(
+            popular_post.comments_count, popular_post.comments.count()
+        )
+        self.assertGreater(popular_post.comments_count, 200 / 300 * 5)
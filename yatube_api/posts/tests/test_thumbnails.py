@@ -0,0 +1,44 @@
+import shutil
+import tempfile
+from unittest import mock
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from sorl.thumbnail import default, get_thumbnail
+from ..models import Post, User
+from ..thumbnails import THUMBNAIL_SIZES, generate_thumbnails
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostsThumbnailsTest(TestCase):
+    """Posts app thumbnails pre-generation test-class."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_generate_thumbnails(self):
+        """Test-function: templates get pre-generated thumbnails."""
+        small_gif = (
+            b'\x47\x49\x46\x38\x39\x61\x02\x00'
+            b'\x01\x00\x80\x00\x00\x00\x00\x00'
+            b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+            b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+            b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+            b'\x0A\x00\x3B'
+        )
+        post = Post.objects.create(
+            text='Пост с картинкой',
+            author=User.objects.create_user(username='test_user'),
+            image=SimpleUploadedFile(
+                name='small.gif', content=small_gif, content_type='image/gif'
+            )
+        )
+        generate_thumbnails(post.image)
+        with mock.patch.object(default.engine, 'get_image') as get_image:
+            for geometry, options in THUMBNAIL_SIZES:
+                get_thumbnail(post.image, geometry, **options)
+        get_image.assert_not_called()
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.test import TestCase
+from ..models import Post, User
+from ..utils import WindowPaginator, get_posts_list
+
+
+class PostsPaginatorTest(TestCase):
+    """Posts app window paginator test-class."""
+
+    POSTS_COUNT: int = 95
+    COUNT_PAGE_POSTS: int = 10
+
+    @classmethod
+    def setUpClass(cls):
+        """Makes class-fixtures for tests of paginator."""
+        super().setUpClass()
+        author = User.objects.create_user(username='test_user')
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=author)
+            for i in range(cls.POSTS_COUNT)
+        )
+
+    def setUp(self):
+        """Set test settings."""
+        cache.clear()
+
+    def get_page(self, number):
+        paginator = WindowPaginator(
+            get_posts_list(), PostsPaginatorTest.COUNT_PAGE_POSTS
+        )
+        return paginator.get_page(number)
+
+    def test_page_without_count_query(self):
+        """Test-function: page is fetched with one query."""
+        with self.assertNumQueries(1):
+            page = self.get_page(2)
+            self.assertEqual(len(page.object_list), 10)
+            self.assertTrue(page.has_next())
+            self.assertTrue(page.has_previous())
+
+    def test_last_page(self):
+        """Test-function: last page has no next page."""
+        page = self.get_page(10)
+        self.assertEqual(len(page.object_list), 5)
+        self.assertFalse(page.has_next())
+
+    def test_count_is_cached(self):
+        """Test-function: count query runs once for the same listing."""
+        self.get_page(1).paginator.count
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.get_page(1).paginator.count,
+                PostsPaginatorTest.POSTS_COUNT
+            )
+
+    def test_page_range_window(self):
+        """Test-function: page range is limited to the current window."""
+        self.assertEqual(list(self.get_page(5).page_range), [3, 4, 5, 6, 7])
+        self.assertEqual(list(self.get_page(1).page_range), [1, 2, 3])
+        self.assertEqual(list(self.get_page(10).page_range), [8, 9, 10])
+
+    def test_out_of_range_page(self):
+        """Test-function: out of range page returns the last page."""
+        self.assertEqual(self.get_page(100).number, 10)
+        self.assertEqual(self.get_page('invalid').number, 1)
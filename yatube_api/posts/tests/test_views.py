@@ -1,6 +1,7 @@
 import os
 import shutil
 import tempfile
+from unittest import mock
 from django.conf import settings
 from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -8,6 +9,8 @@ from django.core.paginator import Page
 from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from http import HTTPStatus
+from core.middleware import QueryBudgetExceeded
+from .. import views
 from ..models import Post, Group, User, Follow
 from ..forms import PostForm, CommentForm
 
@@ -370,6 +373,24 @@ class PostsViewsTest(TestCase):
             msg='Не удалось подписаться на автора'
         )
 
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_follow_query_budget(self):
+        """Test-function: follow query budget is its queries count."""
+        budget = views.profile_follow.query_budget
+        url = reverse(
+            'posts:profile_follow',
+            args=[PostsViewsTest.second_user.username]
+        )
+        with mock.patch.object(views.profile_follow, 'query_budget',
+                               budget - 1):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.auth_client.get(url)
+        Follow.objects.filter(
+            user=PostsViewsTest.user, following=PostsViewsTest.second_user
+        ).delete()
+        response = self.auth_client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
     def test_user_can_unfollow(self):
         """Test-function: user can unfollow."""
         user = PostsViewsTest.user
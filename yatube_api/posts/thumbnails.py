@@ -0,0 +1,75 @@
+"""
+Posts app's thumbnails pre-generation functions.
+
+Thumbnails are generated off the request path, so the `thumbnail` tag in
+templates only reads the sorl key-value store. THUMBNAIL_SIZES must match
+the geometry and options used by the templates.
+"""
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection, transaction
+from sorl.thumbnail import get_thumbnail
+from sorl.thumbnail import base
+from core import metrics
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZES = (
+    ('960x339', {'crop': 'center', 'upscale': True}),
+)
+
+_executor = None
+
+
+class ThumbnailBackend(base.ThumbnailBackend):
+    """Thumbnail backend, which time is added to the request metrics."""
+
+    def get_thumbnail(self, file_, geometry_string, **options):
+        with metrics.timer('thumbnail'):
+            return super().get_thumbnail(file_, geometry_string, **options)
+
+
+def get_executor() -> Executor:
+    """Function returns the process-wide thumbnails thread pool."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.THUMBNAIL_WORKERS,
+            thread_name_prefix='thumbnails'
+        )
+    return _executor
+
+
+def generate_thumbnails(image) -> None:
+    """Function generates all thumbnail sizes of the image."""
+    for geometry, options in THUMBNAIL_SIZES:
+        get_thumbnail(image, geometry, **options)
+
+
+def generate_post_thumbnails(post_id: int) -> None:
+    """Function generates thumbnails of the post image in a worker."""
+    try:
+        post = Post.objects.only('image').filter(pk=post_id).first()
+        if post is not None and post.image:
+            generate_thumbnails(post.image)
+    except Exception:
+        logger.exception('Thumbnails of post %s are not generated', post_id)
+    finally:
+        connection.close()
+
+
+def schedule_thumbnails(post: Post) -> None:
+    """
+    Function queues thumbnails generation after the transaction commit.
+    THUMBNAIL_WORKERS = 0 generates them in the calling thread.
+    """
+    if not post.image:
+        return
+    if settings.THUMBNAIL_WORKERS:
+        transaction.on_commit(
+            lambda: get_executor().submit(generate_post_thumbnails, post.pk)
+        )
+    else:
+        transaction.on_commit(lambda: generate_thumbnails(post.image))
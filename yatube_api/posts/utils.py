@@ -1,17 +1,128 @@
 """
 Posts app's utils functions.
 """
-from django.core.paginator import Paginator, Page
+from hashlib import md5
+from typing import Optional
+from django.core.cache import cache
+from django.core.paginator import (
+    EmptyPage, Page, PageNotAnInteger, Paginator
+)
 from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection
 from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
 from .models import Post
 
+COUNT_PAGE_POSTS: int = 10
+# Count cache lifetime (seconds) and number of page links around current page
+PAGINATOR_COUNT_TTL: int = 60
+PAGINATOR_WINDOW: int = 2
+# Unfiltered tables bigger than this are counted by the planner estimate
+ESTIMATE_COUNT_THRESHOLD: int = 100000
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """Function returns PostgreSQL rows estimate for unfiltered queryset."""
+    if connection.vendor != 'postgresql' or queryset.query.where:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE relname = %s',
+            [queryset.model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < ESTIMATE_COUNT_THRESHOLD:
+        return None
+    return int(row[0])
+
+
+def get_cached_count(queryset: QuerySet) -> int:
+    """Function returns queryset rows count, cached for a short time."""
+    key = 'paginator-count:' + md5(
+        str(queryset.query).encode()
+    ).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = estimate_count(queryset)
+        if count is None:
+            count = queryset.count()
+        cache.set(key, count, PAGINATOR_COUNT_TTL)
+    return count
+
+
+class WindowPage(Page):
+    """Page, which knows about the next page without counting rows."""
+
+    def __init__(self, object_list, number, paginator, has_next: bool):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    @property
+    def page_range(self) -> range:
+        """Page numbers around the current page."""
+        first = max(self.number - PAGINATOR_WINDOW, 1)
+        last = max(
+            min(self.number + PAGINATOR_WINDOW, self.paginator.num_pages),
+            self.number + int(self._has_next)
+        )
+        return range(first, last + 1)
+
+
+class WindowPaginator(Paginator):
+    """
+    Paginator, which fetches per_page + 1 rows to detect the next page
+    and only uses a cached (or estimated) count for the last page link.
+    """
+
+    def validate_number(self, number) -> int:
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number) -> WindowPage:
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(
+            self.object_list[bottom:bottom + self.per_page + 1]
+        )
+        if not object_list and number > 1:
+            raise EmptyPage('That page contains no results')
+        return WindowPage(
+            object_list[:self.per_page],
+            number,
+            self,
+            len(object_list) > self.per_page
+        )
+
+    def get_page(self, number) -> WindowPage:
+        try:
+            return super().get_page(number)
+        except EmptyPage:
+            pass
+        try:
+            return self.page(self.num_pages)
+        except EmptyPage:
+            return self.page(1)
+
+    @cached_property
+    def count(self) -> int:
+        return get_cached_count(self.object_list)
+
 
 def get_paginator_page_object(request: WSGIRequest,
-                              object_list: QuerySet) -> Page:
+                              object_list: QuerySet,
+                              paginator_class=WindowPaginator) -> Page:
     """Function creates Page-object using paginator and returns him."""
-    count_page_posts = 10
-    paginator = Paginator(object_list, count_page_posts)
+    paginator = paginator_class(object_list, COUNT_PAGE_POSTS)
     return paginator.get_page(request.GET.get('page'))
 
 
@@ -19,6 +130,6 @@ def get_posts_list(*args, **kwargs) -> QuerySet:
     """Function returns posts list from Post-model with related objects."""
     queryset = (
         Post.objects.select_related('group', 'author')
-            .filter(*args, **kwargs).order_by('-pub_date')
+            .filter(*args, **kwargs).order_by('-pub_date', '-id')
     )
     return queryset.all()
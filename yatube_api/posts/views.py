@@ -1,12 +1,16 @@
 from django.contrib.auth.decorators import login_required
 from django.core.handlers.wsgi import WSGIRequest
-from django.db.models import Count
 from django.shortcuts import render, get_object_or_404, Http404, redirect
+from django.utils.http import urlencode
+from core.cache import cache_page_for_anonymous
+from core.middleware import query_budget
 from .forms import PostForm, CommentForm
 from .models import Post, Group, User
-from . import utils
+from . import feed, graph, search, utils
 
 
+@query_budget(6)
+@cache_page_for_anonymous()
 def index(request: WSGIRequest):
     """Index page view-function."""
     posts = utils.get_posts_list()
@@ -17,6 +21,8 @@ def index(request: WSGIRequest):
     return render(request, template, context)
 
 
+@query_budget(7)
+@cache_page_for_anonymous()
 def group_posts(request: WSGIRequest, slug: str):
     """Group page view-function."""
     group = get_object_or_404(Group, slug=slug)
@@ -29,12 +35,18 @@ def group_posts(request: WSGIRequest, slug: str):
     return render(request, template, context)
 
 
+@query_budget(8)
+@cache_page_for_anonymous()
 def profile(request: WSGIRequest, username: str):
     """Profile page view-function."""
-    author = get_object_or_404(User, username=username)
+    author = get_object_or_404(
+        User.objects.select_related('stats'), username=username
+    )
     posts = utils.get_posts_list(author=author)
-    following = (request.user.is_authenticated
-                 and author.following.filter(user=request.user).exists())
+    following = (
+        request.user.is_authenticated
+        and graph.is_following(request.user.id, [author.id])[author.id]
+    )
     template = 'posts/profile.html'
     context = {
         'author': author,
@@ -44,10 +56,27 @@ def profile(request: WSGIRequest, username: str):
     return render(request, template, context)
 
 
+@query_budget(5)
+@cache_page_for_anonymous()
+def search_posts(request: WSGIRequest):
+    """Full-text search page view-function."""
+    query = request.GET.get('q', '').strip()
+    posts = search.search_posts(utils.get_posts_list(), query)
+    template = 'posts/search.html'
+    context = {
+        'query': query,
+        'page_query': urlencode({'q': query}) + '&',
+        'page_obj': utils.get_paginator_page_object(request, posts)
+    }
+    return render(request, template, context)
+
+
+@query_budget(6)
+@cache_page_for_anonymous()
 def post_detail(request: WSGIRequest, post_id: int):
     """Post detail page view-function."""
-    post = (Post.objects.select_related('group', 'author').filter(pk=post_id)
-            .annotate(author_posts_count=Count('author__posts')).first())
+    post = (Post.objects.select_related('group', 'author__stats')
+            .filter(pk=post_id).first())
 
     if post is None:
         raise Http404(f'По коду {post_id} пост не найден!')
@@ -64,6 +93,7 @@ def post_detail(request: WSGIRequest, post_id: int):
     return render(request, template, context)
 
 
+@query_budget(11)
 @login_required
 def post_create(request: WSGIRequest):
     """Post creation page view-function."""
@@ -86,6 +116,7 @@ def post_create(request: WSGIRequest):
     return render(request, template, context)
 
 
+@query_budget(12)
 @login_required
 def post_edit(request: WSGIRequest, post_id: int):
     """Post editing page view-function."""
@@ -112,6 +143,7 @@ def post_edit(request: WSGIRequest, post_id: int):
     return render(request, template, context)
 
 
+@query_budget(8)
 @login_required
 def add_comment(request, post_id):
     """Comment adding view-function."""
@@ -127,11 +159,12 @@ def add_comment(request, post_id):
     return redirect('posts:post_detail', post_id=post_id)
 
 
+@query_budget(6)
 @login_required
 def follow_index(request):
     """Follow index page view-function."""
     template = 'posts/follow.html'
-    posts = utils.get_posts_list(author__following__user=request.user)
+    posts = feed.get_feed(request.user)
     context = {
         'page_obj': utils.get_paginator_page_object(request, posts)
     }
@@ -139,6 +172,7 @@ def follow_index(request):
     return render(request, template, context)
 
 
+@query_budget(8)
 @login_required
 def profile_follow(request, username):
     author = get_object_or_404(User, username=username)
@@ -147,6 +181,7 @@ def profile_follow(request, username):
     return redirect('posts:profile', username=username)
 
 
+@query_budget(10)
 @login_required
 def profile_unfollow(request, username):
     author = get_object_or_404(User, username=username)
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube_api.settings')
 
 application = get_asgi_application()
+
+# Compile templates before the first request, not during it
+from core.template_backends import precompile_templates  # noqa: E402
+
+precompile_templates()
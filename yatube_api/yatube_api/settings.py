@@ -1,4 +1,5 @@
 import os
+import sys
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -39,7 +40,6 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'djoser',
-    'debug_toolbar',
     'sorl.thumbnail',
     'api',
     'posts.apps.PostsConfig',
@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,35 +57,69 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# Development profile: debug-only apps and middleware aren't loaded
+# in production (media serving and toolbar urls are in urls.py)
+if DEBUG:
+    INSTALLED_APPS += ['debug_toolbar']
+    MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
+
 ROOT_URLCONF = 'yatube_api.urls'
 
+TEMPLATES_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+TEMPLATES_CONTEXT_PROCESSORS = [
+    'django.template.context_processors.request',
+    'django.contrib.auth.context_processors.auth',
+    'django.contrib.messages.context_processors.messages',
+    'core.context_processors.year.year',
+    'core.context_processors.fragments.fragment_cache',
+]
+# Production profile: compiled templates are kept by the cached loader
+# and the TEMPLATES_PRECOMPILE ones are compiled at the server startup.
+# Development profile reloads changed templates and adds debug context
+TEMPLATES_CACHED = os.getenv('TEMPLATES_CACHED', str(not DEBUG)) == 'True'
+TEMPLATES_PRECOMPILE = ['base.html', 'posts/*', 'includes/*', 'core/*']
+if DEBUG:
+    TEMPLATES_CONTEXT_PROCESSORS.insert(
+        0, 'django.template.context_processors.debug'
+    )
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template_backends.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-                'core.context_processors.year.year'
-            ],
+            'loaders': (
+                [('django.template.loaders.cached.Loader', TEMPLATES_LOADERS)]
+                if TEMPLATES_CACHED else TEMPLATES_LOADERS
+            ),
+            'context_processors': TEMPLATES_CONTEXT_PROCESSORS,
         },
     },
 ]
 
 WSGI_APPLICATION = 'yatube_api.wsgi.application'
 
+# Per-process LocMemCache by default. Multi-worker deployments must use
+# a shared backend, e.g. django.core.cache.backends.filebased.FileBasedCache
+# or a Redis backend (django_redis.cache.RedisCache).
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
+# Lifetime of cached pages in seconds
+CACHE_TTL = int(os.getenv('CACHE_TTL', 60))
+# Lifetime of cached post cards in seconds. Cards are keyed on the post edit
+# time and the rendered author and group fields, so they are never stale
+FRAGMENT_CACHE_TTL = int(os.getenv('FRAGMENT_CACHE_TTL', 3600))
 
 DATABASES = {
     'default': {
@@ -93,9 +128,18 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT')
+        'PORT': os.getenv('DB_PORT'),
+        # Seconds to keep a connection open between requests, 0 closes it
+        # after every request
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 0)),
     }
 }
+# Pooled mode: connections go through a PgBouncer-like pooler in
+# transaction mode, which doesn't support server-side cursors
+if os.getenv('DB_POOL') == 'pgbouncer':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+# Ping persistent connections at request start and drop stale ones
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS') == 'True'
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -132,19 +176,46 @@ MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Thumbnails pre-generation threads, 0 generates them in the request thread
+THUMBNAIL_WORKERS = int(os.getenv('THUMBNAIL_WORKERS', 2))
+THUMBNAIL_BACKEND = 'posts.thumbnails.ThumbnailBackend'
+
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
 
+# Per-view metrics: views over their query budget fail tests and
+# are logged otherwise
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', str(TESTING)) == 'True'
+# Server-Timing header reveals queries and timings of views, so only
+# INTERNAL_IPS requests get it, unless it's public
+SERVER_TIMING_PUBLIC = os.getenv('SERVER_TIMING_PUBLIC') == 'True'
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
 }
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+# Seconds to cache user's is_active for tokens authentication, so blocked
+# users lose access within this time. 0 trusts the token claim until expiry
+JWT_USER_STATUS_TTL = int(os.getenv('JWT_USER_STATUS_TTL', 60))
+
+# Follow-feed
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv('FEED_FANOUT_MAX_FOLLOWERS', 10000))
+FEED_BACKFILL_SIZE = int(os.getenv('FEED_BACKFILL_SIZE', 100))
+# Seconds to cache users' followed authors and followers ids. Changed ids
+# are dropped from the cache of the writing process only, so with several
+# workers the default LocMemCache serves stale follow status up to the TTL:
+# they must share a cache (CACHE_BACKEND) or set FOLLOW_GRAPH_TTL=0
+FOLLOW_GRAPH_TTL = int(os.getenv('FOLLOW_GRAPH_TTL', 3600))
+
+# Full-text search: PostgreSQL text search configuration of the posts index
+SEARCH_CONFIG = os.getenv('SEARCH_CONFIG', 'russian')
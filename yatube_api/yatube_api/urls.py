@@ -3,6 +3,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
 from django.urls import path, include
+from core.views import metrics_view
 
 
 urlpatterns = [
@@ -14,6 +15,7 @@ urlpatterns = [
     path('api/', include('api.urls')),
     path('redoc/',
          TemplateView.as_view(template_name='redoc.html'), name='redoc'),
+    path('metrics/', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG:
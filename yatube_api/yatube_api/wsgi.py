@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube_api.settings')
 
 application = get_wsgi_application()
+
+# Compile templates before the first request, not during it
+from core.template_backends import precompile_templates  # noqa: E402
+
+precompile_templates()